@@ -6,6 +6,7 @@
     from django.core.exceptions import ValidationError
     from django.core.validators import validate_email, URLValidator
     from django.http import HttpResponse
+    from django.http import StreamingHttpResponse  # noqa: F401
     from django.http import QueryDict  # noqa: F401
     from django.template import RequestContext
     from django.template.loader import render_to_string
@@ -110,6 +111,18 @@ def _headers(self):
 
     HttpResponseBase = HttpResponse
 
+    class StreamingHttpResponse(HttpResponse):
+        def __init__(self, streaming_content, content_type=None):
+            from flask import (
+                Response,
+                stream_with_context,
+            )
+
+            self.r = Response(stream_with_context(streaming_content), content_type=content_type)
+
+        def __setitem__(self, key, value):
+            self.r.headers[key] = value
+
     def format_html(format_string, *args, **kwargs):
         return Markup(format_string).format(*args, **kwargs)
 
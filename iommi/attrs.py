@@ -2,10 +2,13 @@
 
 from iommi._web_compat import mark_safe
 from iommi.base import items
-from iommi.evaluate import evaluate_strict
+from iommi.evaluate import (
+    evaluate_strict,
+    signature_from_kwargs,
+)
 
 
-def evaluate_attrs(obj, **kwargs):
+def evaluate_attrs(obj, __signature=None, **kwargs):
     attrs = obj.attrs or {}
 
     # Micro optimization
@@ -14,7 +17,10 @@ def evaluate_attrs(obj, **kwargs):
     if not attrs and not iommi_debug_on():
         return ''
 
-    classes = evaluate_strict(attrs.get('class', {}), **kwargs)
+    if __signature is None:
+        __signature = signature_from_kwargs(kwargs)
+
+    classes = evaluate_strict(attrs.get('class', {}), __signature=__signature, **kwargs)
 
     assert not isinstance(
         classes, str
@@ -25,7 +31,7 @@ def evaluate_attrs(obj, **kwargs):
 
     field__class={'foo-bar': true}"""
 
-    styles = evaluate_strict(attrs.get('style', {}), **kwargs)
+    styles = evaluate_strict(attrs.get('style', {}), __signature=__signature, **kwargs)
 
     assert not isinstance(
         styles, str
@@ -38,9 +44,13 @@ def evaluate_attrs(obj, **kwargs):
 
     return Attrs(
         obj,
-        **{'class': {k: evaluate_strict(v, **kwargs) for k, v in items(classes)}},
-        style={k: evaluate_strict(v, **kwargs) for k, v in items(styles)},
-        **{k: evaluate_strict(v, **kwargs) for k, v in items(attrs) if k not in ('class', 'style')},
+        **{'class': {k: evaluate_strict(v, __signature=__signature, **kwargs) for k, v in items(classes)}},
+        style={k: evaluate_strict(v, __signature=__signature, **kwargs) for k, v in items(styles)},
+        **{
+            k: evaluate_strict(v, __signature=__signature, **kwargs)
+            for k, v in items(attrs)
+            if k not in ('class', 'style')
+        },
     )
 
 
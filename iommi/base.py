@@ -1,6 +1,9 @@
+from operator import attrgetter
+
 from django.db.models import QuerySet
 from django.utils.encoding import force_str
 from django.utils.safestring import SafeText
+from tri_declarative import getattr_path
 
 NOT_BOUND_MESSAGE = (
     'This object is not bound. You need to call `.bind(request=request)` before you can call this function.'
@@ -66,6 +69,16 @@ def keys(container):
     return type(container).keys(container)
 
 
+def is_static(value):
+    """
+    Returns True if `value` renders the same on every request: strings, numbers, `None`, or dicts of those. Callables and
+    lazy translations are not static.
+    """
+    if isinstance(value, dict):
+        return all(is_static(x) for x in values(value))
+    return value is None or isinstance(value, (str, int, float))
+
+
 def get_display_name(part):
     try:
         if part.model_field.verbose_name:
@@ -73,3 +86,39 @@ def get_display_name(part):
     except AttributeError:
         pass
     return capitalize(force_str(part._name).rsplit('__', 1)[-1].replace("_", " "))
+
+
+def attr_getter(attr):
+    """
+    Returns a function that is equivalent to `getattr_path(row, attr)`, but with the path parsed once up front.
+    """
+    if attr is None:
+        return lambda row: None
+    if attr == '':
+        return lambda row: row
+
+    names = attr.split('__')
+    if len(names) == 1 and '.' not in attr:
+        get = attrgetter(attr)
+
+        def getter(row):
+            try:
+                return get(row)
+            except AttributeError:
+                # Let getattr_path produce the nice error message
+                return getattr_path(row, attr)
+
+        return getter
+
+    def getter(row):
+        current = row
+        try:
+            for name in names:
+                current = getattr(current, name)
+                if current is None:
+                    return None
+        except AttributeError:
+            return getattr_path(row, attr)
+        return current
+
+    return getter
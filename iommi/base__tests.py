@@ -12,6 +12,7 @@
     build_as_view_wrapper,
     capitalize,
     get_display_name,
+    is_static,
     model_and_rows,
     UnknownMissingValueException,
 )
@@ -88,3 +89,12 @@ def test_crash_in_templates():
 
     # ...but inside if it's fine
     assert Template('{% if foo %}foo{% endif %}').render(context=RequestContext(req('get'))) == ''
+
+
+def test_is_static():
+    assert is_static('foo')
+    assert is_static(None)
+    assert is_static({'class': {'foo': True}, 'style': {'width': 3}, 'title': 'bar'})
+    assert not is_static(lambda **_: 'foo')
+    assert not is_static({'class': {'foo': lambda **_: True}})
+    assert not is_static(object())
@@ -10,6 +10,7 @@
     EvaluatedRefinable,
     get_long_path_by_path,
     get_path_by_long_path,
+    get_path_maps,
     Traversable,
 )
 
@@ -74,6 +75,10 @@ def find_target(*, path, root):
     p = path[1:]
 
     long_path = get_long_path_by_path(root).get(p)
+    if long_path is None and p not in get_path_by_long_path(root):
+        # The tree differs from the one the shared maps were built from
+        get_path_maps(root, rebuild=True)
+        long_path = get_long_path_by_path(root).get(p)
     if long_path is None:
         long_path = p
         if long_path not in keys(get_path_by_long_path(root)):
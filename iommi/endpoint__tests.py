@@ -65,7 +65,7 @@ class MyPage(Page):
 
 def test_find_target():
     # To build paths: _declared_members: Struct, and optionally name
-    # To find target: _long_path_by_path: Dict on root
+    # To find target: the path maps from get_path_maps, shared by the binds of the same declared root
 
     bar = StubTraversable(_name='bar')
     foo = StubTraversable(
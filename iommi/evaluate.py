@@ -1,4 +1,6 @@
 import inspect
+import sys
+from functools import lru_cache
 
 from tri_declarative import Namespace
 
@@ -7,17 +9,18 @@
     keys,
 )
 
-_matches_cache = {}
+# Both caches are bounded, since dynamically created callables can produce an unbounded number of signatures in a
+# long running process. lru_cache is thread safe and gives us hit/miss statistics via matches_cache_info().
+MATCHES_CACHE_SIZE = 10000
+SIGNATURE_CACHE_SIZE = 1000
 
 
 def matches(caller_parameters, callee_parameters, __match_empty=False):
-    cache_key = ';'.join((caller_parameters, callee_parameters))  # pragma: no mutate
-    cached_value = _matches_cache.get(
-        cache_key, None
-    )  # pragma: no mutate (mutation changes this to cached_value = None, which just slows down the code)
-    if cached_value is not None:
-        return cached_value
+    return _matches(caller_parameters, callee_parameters, __match_empty)
 
+
+@lru_cache(maxsize=MATCHES_CACHE_SIZE)
+def _matches(caller_parameters, callee_parameters, match_empty):
     caller = set(caller_parameters.split(',')) if caller_parameters else set()
 
     a, b, c = callee_parameters.split('|')
@@ -25,18 +28,25 @@ def matches(caller_parameters, callee_parameters, __match_empty=False):
     optional = set(b.split(',')) if b else set()
     wildcard = c == '*'
 
-    if not __match_empty and not required and not optional and wildcard:
+    if not match_empty and not required and not optional and wildcard:
         return False  # Special case to not match no-specification function "lambda **whatever: ..."
 
     if wildcard:
-        result = caller >= required
+        return caller >= required
     else:
-        result = required <= caller <= required.union(optional)
+        return required <= caller <= required.union(optional)
+
+
+def matches_cache_info():
+    """
+    Statistics for the signature match cache, as a named tuple of hits, misses, maxsize and currsize.
+    """
+    return _matches.cache_info()
+
 
-    _matches_cache[
-        cache_key
-    ] = result  # pragma: no mutate (mutation changes result to None which just makes things slower)
-    return result
+def clear_matches_cache():
+    _matches.cache_clear()
+    _signature_from_keys.cache_clear()
 
 
 def get_callable_description(c):
@@ -73,7 +83,7 @@ def evaluate(func_or_value, __signature=None, __strict=False, __match_empty=True
 
 def evaluate_strict(func_or_value, __signature=None, __match_empty=True, **kwargs):
     # noinspection PyArgumentEqualDefault
-    return evaluate(func_or_value, __signature=None, __strict=True, __match_empty=__match_empty, **kwargs)
+    return evaluate(func_or_value, __signature=__signature, __strict=True, __match_empty=__match_empty, **kwargs)
 
 
 def get_signature(func):
@@ -102,7 +112,7 @@ def get_signature(func):
         optional = ''
     wildcard = '*' if varkw is not None else ''
 
-    signature = '|'.join((required, optional, wildcard))
+    signature = sys.intern('|'.join((required, optional, wildcard)))
     try:
         object.__setattr__(func, '__tri_declarative_signature', signature)
     except TypeError:
@@ -114,20 +124,30 @@ def get_signature(func):
 
 
 def signature_from_kwargs(kwargs):
-    return ','.join(sorted(keys(kwargs)))
+    # The same keys are passed in the same order over and over (e.g. once per cell), so we skip the sorting for those
+    return _signature_from_keys(tuple(kwargs))
+
+
+@lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+def _signature_from_keys(kwargs_keys):
+    return sys.intern(','.join(sorted(kwargs_keys)))
 
 
-def evaluate_members(obj, keys, **kwargs):
+def evaluate_members(obj, keys, __signature=None, **kwargs):
+    if __signature is None:
+        __signature = signature_from_kwargs(kwargs)
     for key in keys:
-        evaluate_member(obj, key, **kwargs)
+        evaluate_member(obj, key, __signature=__signature, **kwargs)
 
 
-def evaluate_member(obj, key, strict=True, **kwargs):
+def evaluate_member(obj, key, strict=True, __signature=None, **kwargs):
     value = getattr(obj, key)
-    new_value = evaluate(value, __strict=strict, **kwargs)
+    new_value = evaluate(value, __signature=__signature, __strict=strict, **kwargs)
     if new_value is not value:
         setattr(obj, key, new_value)
 
 
-def evaluate_strict_container(c, **kwargs):
-    return Namespace({k: evaluate_strict(v, **kwargs) for k, v in items(c)})
+def evaluate_strict_container(c, __signature=None, **kwargs):
+    if __signature is None:
+        __signature = signature_from_kwargs(kwargs)
+    return Namespace({k: evaluate_strict(v, __signature=__signature, **kwargs) for k, v in items(c)})
@@ -1,6 +1,7 @@
 import pytest
 
 from iommi.evaluate import (
+    clear_matches_cache,
     evaluate,
     evaluate_member,
     evaluate_strict,
@@ -8,7 +9,9 @@
     get_callable_description,
     get_signature,
     matches,
+    matches_cache_info,
     Namespace,
+    signature_from_kwargs,
 )
 
 
@@ -78,6 +81,25 @@ def test_match_caching():
     assert not matches("a,b", "c||*")
 
 
+def test_match_cache_info():
+    clear_matches_cache()
+    assert matches_cache_info().currsize == 0
+
+    assert matches("a,b", "a,b||")
+    assert matches("a,b", "a,b||")
+    assert not matches("a,b", "c||*")
+
+    info = matches_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+    assert info.maxsize is not None
+
+
+def test_signature_from_kwargs():
+    assert signature_from_kwargs(dict(b=1, a=2)) == 'a,b'
+    assert signature_from_kwargs(dict(a=1, b=2)) == 'a,b'
+    assert signature_from_kwargs({}) == ''
+
+
 def test_get_signature_description():
     assert get_signature(lambda a, b: None) == 'a,b||'
     assert get_signature(lambda a, b, c, d=None, e=None: None) == 'a,b,c|d,e|'
@@ -0,0 +1,401 @@
+import csv
+import json
+import re
+import zipfile
+from datetime import datetime
+from decimal import Decimal
+from io import RawIOBase
+from urllib.parse import quote_plus
+from xml.sax.saxutils import escape
+
+import django
+from django.db.models import QuerySet
+
+from iommi._web_compat import (
+    HttpResponse,
+    smart_str,
+    StreamingHttpResponse,
+)
+from iommi.base import values
+
+DEFAULT_REPORT_CHUNK_SIZE = 2000
+
+
+def iterate_rows_in_chunks(rows, chunk_size):
+    """
+    Iterate over `rows` without caching the entire result. Querysets are
+    fetched from the database `chunk_size` rows at a time.
+    """
+    if not isinstance(rows, QuerySet):
+        yield from rows
+        return
+
+    if not rows._prefetch_related_lookups or django.VERSION >= (4, 1):
+        yield from rows.iterator(chunk_size=chunk_size)
+        return
+
+    # QuerySet.iterator() ignores prefetch_related before Django 4.1, so we fetch slices instead
+    if not rows.ordered:
+        rows = rows.order_by('pk')
+    bottom = 0
+    while True:
+        chunk = list(rows[bottom : bottom + chunk_size])
+        yield from chunk
+        if len(chunk) < chunk_size:
+            return
+        bottom += chunk_size
+
+
+def report_value_getter(column):
+    """
+    Returns a function that gets the report value of `column` from a `Cells`. For plain attribute columns the value
+    is read straight from the row, without creating a `Cell`.
+    """
+    if 'report_value' in column.extra_evaluated:
+        value = column.extra_evaluated.report_value
+        return lambda cells: value
+
+    # noinspection PyProtectedMember
+    value_getter = column.table._row_render_plan.cell_render_plan(column).value_getter
+    if value_getter is not None:
+        return lambda cells: value_getter(cells.row)
+
+    name = column._name
+    return lambda cells: cells[name].value
+
+
+def extract_batches(*, columns, cells_for_rows, batch_size):
+    """
+    Extract the report values of `columns` for each row. The values are
+    yielded in column oriented batches of up to `batch_size` rows, i.e. a
+    list with one list of values per column.
+    """
+    getters = [report_value_getter(column) for column in columns]
+    batch = [[] for _ in columns]
+    number_of_rows = 0
+    for cells in cells_for_rows:
+        for column_values, getter in zip(batch, getters):
+            column_values.append(getter(cells))
+        number_of_rows += 1
+        if number_of_rows == batch_size:
+            yield batch
+            batch = [[] for _ in columns]
+            number_of_rows = 0
+
+    if number_of_rows:
+        yield batch
+
+
+class ExportWriter:
+    """
+    Base class for the formats of the export pipeline. A writer gets the
+    columns to export, and then produces the output in chunks: `header()`,
+    then `write_batch(batch)` for each column oriented batch of values,
+    and finally `footer()`. Chunks can be `str` or `bytes`.
+
+    Register your own formats with `register_export_format`.
+    """
+
+    display_name = None
+    extension = None
+    content_type = None
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.column_names = [c.extra_evaluated.report_name for c in columns]
+
+    def header(self):
+        return ''
+
+    def write_batch(self, batch):
+        raise NotImplementedError()  # pragma: no cover
+
+    def footer(self):
+        return ''
+
+    def chunks(self, batches):
+        """Yield the output encoded as bytes."""
+        for chunk in self._chunks(batches):
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                yield chunk
+
+    def _chunks(self, batches):
+        yield self.header()
+        for batch in batches:
+            yield self.write_batch(batch)
+        yield self.footer()
+
+
+class _Echo:
+    """
+    File-like object for `csv.writer` that just hands back what is written to it.
+    """
+
+    def write(self, value):
+        return value
+
+
+def smart_text2(s):
+    if s is None:
+        return ''
+    elif isinstance(s, float):
+        result = ('%f' % s).strip('0')
+        if result[-1] == '.':
+            result += '0'
+        return result
+    else:
+        assert not isinstance(s, bytes)
+        return str(s).strip()
+
+
+def safe_csv_value(value):
+    # CSV formula injection protection: http://georgemauer.net/2017/10/07/csv-injection.html
+    if value and value[0] in ('+', '-', '@', '='):
+        return '\t' + value
+    else:
+        return value
+
+
+class CsvWriter(ExportWriter):
+    display_name = 'CSV'
+    extension = 'csv'
+    content_type = 'text/csv'
+    dialect = 'excel'
+
+    def __init__(self, columns):
+        super(CsvWriter, self).__init__(columns)
+        self.writer = csv.writer(_Echo(), dialect=self.dialect)
+        self.csv_safe = [('csv_whitelist' in c.extra) for c in columns]
+
+    def header(self):
+        return self.writer.writerow(self.column_names)
+
+    def write_batch(self, batch):
+        writerow = self.writer.writerow
+        result = []
+        for row in zip(*batch):
+            row_strings = [smart_text2(value) for value in row]
+            result.append(writerow([v if safe else safe_csv_value(v) for v, safe in zip(row_strings, self.csv_safe)]))
+        return ''.join(result)
+
+
+class TsvWriter(CsvWriter):
+    display_name = 'TSV'
+    extension = 'tsv'
+    content_type = 'text/tab-separated-values'
+    dialect = 'excel-tab'
+
+
+def json_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+class JsonLinesWriter(ExportWriter):
+    display_name = 'JSON Lines'
+    extension = 'jsonl'
+    content_type = 'application/x-ndjson'
+
+    def write_batch(self, batch):
+        names = self.column_names
+        return ''.join(
+            json.dumps({name: json_value(value) for name, value in zip(names, row)}) + '\n' for row in zip(*batch)
+        )
+
+
+class _ChunkBuffer(RawIOBase):
+    """
+    Write-only, unseekable stream that collects what is written to it until
+    it is taken. This lets `zipfile` produce a zip file in chunks.
+    """
+
+    def __init__(self):
+        super(_ChunkBuffer, self).__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def take(self):
+        result = b''.join(self._chunks)
+        self._chunks = []
+        return result
+
+
+_xlsx_content_types = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+</Types>'''
+
+_xlsx_rels = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>'''
+
+_xlsx_workbook = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets>
+</workbook>'''
+
+_xlsx_workbook_rels = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+</Relationships>'''
+
+_xlsx_sheet_start = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'''
+
+_xlsx_sheet_end = '</sheetData></worksheet>'
+
+# Control characters are not allowed in XML, even escaped
+_xml_illegal_characters = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def xlsx_column_letter(index):
+    result = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        result = chr(ord('A') + remainder) + result
+    return result
+
+
+def xlsx_cell(reference, value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return f'<c r="{reference}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)) and value == value and value not in (float('inf'), float('-inf')):
+        return f'<c r="{reference}"><v>{value}</v></c>'
+    text = escape(_xml_illegal_characters.sub('', str(value)))
+    return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+class XlsxWriter(ExportWriter):
+    """
+    Minimal pure-Python XLSX writer with a single sheet. Strings are written
+    inline so the sheet can be written to the zip file as it is produced.
+    """
+
+    display_name = 'XLSX'
+    extension = 'xlsx'
+    content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+    def __init__(self, columns):
+        super(XlsxWriter, self).__init__(columns)
+        self.column_letters = [xlsx_column_letter(i) for i in range(len(columns))]
+        self.row_number = 0
+        self.buffer = _ChunkBuffer()
+        self.zip_file = None
+        self.sheet = None
+
+    def _row(self, row):
+        self.row_number += 1
+        n = self.row_number
+        cells = ''.join(xlsx_cell(f'{letter}{n}', value) for letter, value in zip(self.column_letters, row))
+        return f'<row r="{n}">{cells}</row>'
+
+    def header(self):
+        self.zip_file = zipfile.ZipFile(self.buffer, mode='w', compression=zipfile.ZIP_DEFLATED)
+        self.zip_file.writestr('[Content_Types].xml', _xlsx_content_types)
+        self.zip_file.writestr('_rels/.rels', _xlsx_rels)
+        self.zip_file.writestr('xl/workbook.xml', _xlsx_workbook)
+        self.zip_file.writestr('xl/_rels/workbook.xml.rels', _xlsx_workbook_rels)
+        self.sheet = self.zip_file.open('xl/worksheets/sheet1.xml', mode='w', force_zip64=True)
+        self.sheet.write((_xlsx_sheet_start + self._row(self.column_names)).encode())
+        return self.buffer.take()
+
+    def write_batch(self, batch):
+        self.sheet.write(''.join(self._row(row) for row in zip(*batch)).encode())
+        return self.buffer.take()
+
+    def footer(self):
+        self.sheet.write(_xlsx_sheet_end.encode())
+        self.sheet.close()
+        self.zip_file.close()
+        return self.buffer.take()
+
+
+_writer_class_by_format = {}
+
+
+def register_export_format(name, writer_class):
+    """
+    Register a format for the export endpoint of `Table`. `writer_class`
+    should be an `ExportWriter` subclass.
+    """
+    _writer_class_by_format[name] = writer_class
+
+
+def get_export_writer_class(name):
+    try:
+        return _writer_class_by_format[name]
+    except KeyError:
+        format_names = ', '.join(_writer_class_by_format.keys())
+        raise UnknownExportFormatException(f'Unknown export format {name}. Available formats: {format_names}') from None
+
+
+class UnknownExportFormatException(Exception):
+    pass
+
+
+register_export_format('csv', CsvWriter)
+register_export_format('tsv', TsvWriter)
+register_export_format('jsonl', JsonLinesWriter)
+register_export_format('xlsx', XlsxWriter)
+
+
+def export_response(*, table, writer_class):
+    """
+    Export a table with the given writer. The columns to include are the ones
+    with `extra_evaluated__report_name` set, and the filename is taken from
+    `extra_evaluated__report_name` on the table.
+
+    By default the visible rows are exported and the result is returned in a
+    normal response. Set `extra__report_streaming=True` on the table to
+    instead stream all rows of `sorted_and_filtered_rows` to the client. The
+    rows are fetched and written `extra__report_chunk_size` rows at a time,
+    so memory use stays flat regardless of the size of the export.
+    """
+    columns = [c for c in values(table.columns) if c.extra_evaluated.get('report_name')]
+    assert (
+        columns
+    ), f'To get {writer_class.display_name} output you must specify at least one column with extra_evaluated__report_name'
+    assert (
+        'report_name' in table.extra_evaluated
+    ), f'To get {writer_class.display_name} output you must specify extra_evaluated__report_name on the table'
+    filename = f'{table.extra_evaluated.report_name}.{writer_class.extension}'
+
+    chunk_size = table.extra.get('report_chunk_size', DEFAULT_REPORT_CHUNK_SIZE)
+    streaming = table.extra.get('report_streaming', False)
+    if streaming:
+        cells_for_rows = table.cells_for_rows(
+            rows=iterate_rows_in_chunks(table.sorted_and_filtered_rows, chunk_size=chunk_size)
+        )
+    else:
+        cells_for_rows = table.cells_for_rows()
+
+    writer = writer_class(columns=columns)
+    chunks = writer.chunks(extract_batches(columns=columns, cells_for_rows=cells_for_rows, batch_size=chunk_size))
+
+    if streaming:
+        response = StreamingHttpResponse(chunks, content_type=writer_class.content_type)
+    else:
+        response = HttpResponse(b''.join(chunks), content_type=writer_class.content_type)
+
+    # RFC 2183, RFC 2184
+    response['Content-Disposition'] = smart_str(
+        "attachment; filename*=UTF-8''{value}".format(value=quote_plus(filename))
+    )
+    response['Last-Modified'] = datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
+    return response
@@ -0,0 +1,209 @@
+import json
+import zipfile
+from io import BytesIO
+
+import pytest
+from django.http import StreamingHttpResponse
+from django.test import override_settings
+
+from iommi import (
+    Column,
+    Table,
+)
+from iommi.export import (
+    _writer_class_by_format,
+    CsvWriter,
+    ExportWriter,
+    extract_batches,
+    get_export_writer_class,
+    iterate_rows_in_chunks,
+    register_export_format,
+    UnknownExportFormatException,
+    xlsx_cell,
+    xlsx_column_letter,
+)
+from iommi.table import Struct
+from tests.helpers import req
+from tests.models import (
+    CSVExportTestModel,
+    TBaz,
+    TFoo,
+)
+
+
+def export_table(**kwargs):
+    return Table(
+        columns__a=Column(extra_evaluated__report_name='A'),
+        columns__b=Column(extra_evaluated__report_name='B'),
+        columns__c=Column(),
+        rows=[
+            Struct(a=1, b='x', c='not exported'),
+            Struct(a=2.5, b=None, c='not exported'),
+            Struct(a=True, b='=1+1', c='not exported'),
+        ],
+        extra_evaluated__report_name='foo',
+        **kwargs,
+    )
+
+
+def content(response):
+    if isinstance(response, StreamingHttpResponse):
+        return b''.join(response.streaming_content)
+    return response.content
+
+
+@pytest.mark.django_db
+def test_iterate_rows_in_chunks():
+    foos = [TFoo.objects.create(a=i, b=str(i)) for i in range(5)]
+    baz = TBaz.objects.create()
+    baz.foo.set(foos[:2])
+    TBaz.objects.create()
+
+    assert list(iterate_rows_in_chunks([1, 2, 3], chunk_size=2)) == [1, 2, 3]
+    assert list(iterate_rows_in_chunks(TFoo.objects.all(), chunk_size=2)) == foos
+
+    rows = list(iterate_rows_in_chunks(TBaz.objects.prefetch_related('foo'), chunk_size=1))
+    assert len(rows) == 2
+    assert list(rows[0].foo.all()) == foos[:2]
+
+
+def test_extract_batches():
+    t = export_table(columns__b__extra_evaluated__report_value='fixed')
+    t = t.bind(request=req('get'))
+    columns = [t.columns.a, t.columns.b]
+    batches = list(extract_batches(columns=columns, cells_for_rows=t.cells_for_rows(), batch_size=2))
+    assert batches == [
+        [[1, 2.5], ['fixed', 'fixed']],
+        [[True], ['fixed']],
+    ]
+
+
+def test_export_csv():
+    response = export_table().bind(request=req('get', **{'/export': 'csv'})).render_to_response()
+    assert response['Content-Type'] == 'text/csv'
+    assert response['Content-Disposition'] == "attachment; filename*=UTF-8''foo.csv"
+    assert content(response).decode() == 'A,B\r\n1,x\r\n2.5,\r\nTrue,\t=1+1\r\n'
+
+
+def test_export_tsv():
+    response = export_table().bind(request=req('get', **{'/export': 'tsv'})).render_to_response()
+    assert response['Content-Type'] == 'text/tab-separated-values'
+    assert response['Content-Disposition'] == "attachment; filename*=UTF-8''foo.tsv"
+    assert content(response).decode() == 'A\tB\r\n1\tx\r\n2.5\t\r\nTrue\t"\t=1+1"\r\n'
+
+
+def test_export_jsonl():
+    response = export_table().bind(request=req('get', **{'/export': 'jsonl'})).render_to_response()
+    assert response['Content-Type'] == 'application/x-ndjson'
+    assert [json.loads(x) for x in content(response).decode().splitlines()] == [
+        {'A': 1, 'B': 'x'},
+        {'A': 2.5, 'B': None},
+        {'A': True, 'B': '=1+1'},
+    ]
+
+
+def test_export_xlsx():
+    response = (
+        export_table(extra__report_streaming=True, extra__report_chunk_size=1)
+        .bind(request=req('get', **{'/export': 'xlsx'}))
+        .render_to_response()
+    )
+    assert isinstance(response, StreamingHttpResponse)
+    assert response['Content-Disposition'] == "attachment; filename*=UTF-8''foo.xlsx"
+
+    with zipfile.ZipFile(BytesIO(content(response))) as f:
+        assert f.namelist() == [
+            '[Content_Types].xml',
+            '_rels/.rels',
+            'xl/workbook.xml',
+            'xl/_rels/workbook.xml.rels',
+            'xl/worksheets/sheet1.xml',
+        ]
+        sheet = f.read('xl/worksheets/sheet1.xml').decode()
+
+    assert sheet.endswith(
+        '<sheetData>'
+        '<row r="1">'
+        '<c r="A1" t="inlineStr"><is><t xml:space="preserve">A</t></is></c>'
+        '<c r="B1" t="inlineStr"><is><t xml:space="preserve">B</t></is></c>'
+        '</row>'
+        '<row r="2">'
+        '<c r="A2"><v>1</v></c>'
+        '<c r="B2" t="inlineStr"><is><t xml:space="preserve">x</t></is></c>'
+        '</row>'
+        '<row r="3">'
+        '<c r="A3"><v>2.5</v></c>'
+        '</row>'
+        '<row r="4">'
+        '<c r="A4" t="b"><v>1</v></c>'
+        '<c r="B4" t="inlineStr"><is><t xml:space="preserve">=1+1</t></is></c>'
+        '</row>'
+        '</sheetData></worksheet>'
+    )
+
+
+def test_xlsx_helpers():
+    assert [xlsx_column_letter(i) for i in (0, 25, 26, 27, 701, 702)] == ['A', 'Z', 'AA', 'AB', 'ZZ', 'AAA']
+    assert xlsx_cell('A1', '<&\x01>') == '<c r="A1" t="inlineStr"><is><t xml:space="preserve">&lt;&amp;&gt;</t></is></c>'
+    assert xlsx_cell('A1', float('nan')) == '<c r="A1" t="inlineStr"><is><t xml:space="preserve">nan</t></is></c>'
+
+
+def test_unknown_export_format():
+    with pytest.raises(UnknownExportFormatException) as e:
+        get_export_writer_class('does_not_exist')
+
+    assert str(e.value).startswith('Unknown export format does_not_exist. Available formats: csv, tsv, jsonl, xlsx')
+
+
+def test_register_export_format():
+    class CountWriter(ExportWriter):
+        display_name = 'Count'
+        extension = 'txt'
+        content_type = 'text/plain'
+
+        def __init__(self, columns):
+            super(CountWriter, self).__init__(columns)
+            self.count = 0
+
+        def write_batch(self, batch):
+            self.count += len(batch[0])
+            return ''
+
+        def footer(self):
+            return f'{self.count} rows'
+
+    register_export_format('count', CountWriter)
+    try:
+        response = export_table().bind(request=req('get', **{'/export': 'count'})).render_to_response()
+        assert content(response) == b'3 rows'
+    finally:
+        del _writer_class_by_format['count']
+    assert get_export_writer_class('csv') is CsvWriter
+
+
+@pytest.mark.django_db
+@override_settings(DEBUG=True)
+def test_export_streaming_all_rows():
+    for i in range(5):
+        CSVExportTestModel.objects.create(a=i, b='a', c=2.5)
+    t = Table(
+        auto__model=CSVExportTestModel,
+        columns__a__extra_evaluated__report_name='A',
+        columns__c__extra_evaluated__report_name='C',
+        extra_evaluated__report_name='foo',
+        extra__report_streaming=True,
+        extra__report_chunk_size=2,
+        page_size=2,
+    ).bind(request=req('get', **{'/csv': ''}))
+    response = t.render_to_response()
+    assert isinstance(response, StreamingHttpResponse)
+    assert response['Content-Type'] == 'text/csv'
+
+    chunks = [x.decode() for x in response.streaming_content]
+    # header, then two full chunks and the remaining row. All rows are exported regardless of pagination.
+    assert chunks == [
+        'A,C\r\n',
+        '0,2.5\r\n1,2.5\r\n',
+        '2,2.5\r\n3,2.5\r\n',
+        '4,2.5\r\n',
+    ]
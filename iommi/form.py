@@ -22,10 +22,12 @@
 
 from django.db.models import (
     Case,
+    F,
     IntegerField,
     Model,
     Q,
     QuerySet,
+    Value,
     When,
 )
 from django.utils.translation import gettext
@@ -261,30 +263,30 @@ def choice_parse(form, field, string_value):
 
 
 def choice_queryset__is_valid(field, parsed_data, **_):
+    # Choices looked up by choice_queryset__parse are known to be in field.choices
+    is_parsed_choice = field._choices_by_pk is not None and field._choices_by_pk.get(parsed_data.pk) is parsed_data
     return (
-        field.choices.filter(pk=parsed_data.pk).exists(),
+        is_parsed_choice or field.choices.filter(pk=parsed_data.pk).exists(),
         f'{", ".join(field.raw_data) if field.is_list else field.raw_data} not in available choices',
     )
 
 
-def choice_queryset__endpoint_handler(*, form, field, value, page_size=40, **_):
-    from django.core.paginator import (
-        EmptyPage,
-        Paginator,
-    )
-
+def choice_queryset__endpoint_handler(*, form, field, value, page_size=None, **_):
+    if page_size is None:
+        page_size = field.choices_page_size or 40
     page = int(form.get_request().GET.get('page', 1))
     choices = field.extra.filter_and_sort(form=form, field=field, value=value)
-    try:
-        paginator = Paginator(choices, page_size)
-        result = paginator.page(page)
-        has_more = result.has_next()
-    except EmptyPage:
+
+    # Fetch one extra row to know if there is a next page, instead of paying for a COUNT
+    if page < 1:
         result = []
-        has_more = False
+    else:
+        offset = (page - 1) * page_size
+        result = list(choices[offset : offset + page_size + 1])
+    has_more = len(result) > page_size
 
     return dict(
-        results=field.extra.model_from_choices(form, field, result),
+        results=field.extra.model_from_choices(form, field, result[:page_size]),
         page=page,
         pagination=dict(
             more=has_more,
@@ -304,10 +306,7 @@ def traverse():
     return list(traverse())
 
 
-def choice_queryset__extra__filter_and_sort(field, value, **_):
-    if not value:
-        return field.choices.order_by(*field.search_fields)
-
+def search_strategy__ranked(field, value, **_):
     q_objects = []
 
     def create_q_objects(suffix):
@@ -325,9 +324,106 @@ def create_q_objects(suffix):
     return choices.filter(reduce(or_, q_objects)).order_by('iommi_ranking', *field.search_fields)
 
 
+def search_strategy__prefix(field, value, **_):
+    # Case sensitive on purpose: `istartswith` compiles to `UPPER(col) LIKE UPPER(%s)` which a plain index can't serve
+    q = reduce(or_, [Q(**{search_field + '__startswith': value}) for search_field in field.search_fields])
+    return field.choices.filter(q).order_by(*field.search_fields)
+
+
+def search_strategy__exact_first(field, value, **_):
+    exact = reduce(or_, [Q(**{search_field: value}) for search_field in field.search_fields])
+    prefix = reduce(or_, [Q(**{search_field + '__istartswith': value}) for search_field in field.search_fields])
+
+    # Order by annotations since the search fields can be paths, which can't be used to order a union
+    sort_keys = {f'iommi_sort_{i}': F(search_field) for i, search_field in enumerate(field.search_fields)}
+
+    def part(q, rank):
+        return field.choices.order_by().filter(q).annotate(iommi_ranking=Value(rank, IntegerField()), **sort_keys)
+
+    return part(exact, 0).union(part(prefix & ~exact, 1)).order_by('iommi_ranking', *sort_keys)
+
+
+def search_strategy__trigram(field, value, **_):
+    from django.contrib.postgres.search import TrigramSimilarity
+    from django.db.models.functions import Greatest
+
+    similarities = [TrigramSimilarity(search_field, value) for search_field in field.search_fields]
+    similarity = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+    q = reduce(or_, [Q(**{search_field + '__trigram_similar': value}) for search_field in field.search_fields])
+    return (
+        field.choices.filter(q)
+        .annotate(iommi_similarity=similarity)
+        .order_by('-iommi_similarity', *field.search_fields)
+    )
+
+
+_search_strategy_by_name = dict(
+    ranked=search_strategy__ranked,
+    prefix=search_strategy__prefix,
+    exact_first=search_strategy__exact_first,
+    trigram=search_strategy__trigram,
+)
+
+
+def register_search_strategy(name, search_strategy):
+    """
+    Register a search strategy for the `choices` endpoint of `Field.choice_queryset`. `search_strategy`
+    is a callable that gets the keyword arguments `field` and `value` and returns the matching choices, sorted.
+    """
+    _search_strategy_by_name[name] = search_strategy
+
+
+def get_search_strategy(search_strategy):
+    if callable(search_strategy):
+        return search_strategy
+    assert (
+        search_strategy in _search_strategy_by_name
+    ), f'Unknown search strategy {search_strategy}. Available strategies: {", ".join(_search_strategy_by_name)}'
+    return _search_strategy_by_name[search_strategy]
+
+
+def choice_queryset__extra__filter_and_sort(field, value, **_):
+    if not value:
+        return field.choices.order_by(*field.search_fields)
+
+    return get_search_strategy(field.search_strategy)(field=field, value=value)
+
+
+def choices_by_pk(field):
+    """
+    Look up all the submitted choices of a `choice_queryset` field in one query.
+    """
+    if field._choices_by_pk is None:
+        raw_data = field.raw_data if field.is_list else [field.raw_data]
+        pk_field = field.choices.model._meta.pk
+        pks = set()
+        for string_value in raw_data or []:
+            try:
+                pks.add(pk_field.to_python(string_value))
+            except ValidationError:
+                # Invalid pks are looked up one by one to report their errors
+                pass
+        field._choices_by_pk = {x.pk: x for x in field.choices.filter(pk__in=pks)} if pks else {}
+    return field._choices_by_pk
+
+
 def choice_queryset__parse(field, string_value, **_):
+    if not string_value:
+        return None
+
+    try:
+        pk = field.choices.model._meta.pk.to_python(string_value)
+    except ValidationError:
+        # Let the database report what is wrong with the pk
+        pk = string_value
+    else:
+        choices = choices_by_pk(field)
+        if pk in choices:
+            return choices[pk]
+        raise ValidationError(f'{field.choices.model._meta.object_name} matching query does not exist.')
+
     try:
-        return field.choices.get(pk=string_value) if string_value else None
+        return field.choices.get(pk=pk)
     except field.model.DoesNotExist as e:
         raise ValidationError(str(e))
 
@@ -508,10 +604,12 @@ class Field(Part, Tag):
     choice_id_formatter: Callable[..., str] = Refinable()
     choice_display_name_formatter: Callable[..., str] = Refinable()
     choice_to_optgroup: Optional[Callable[..., Optional[str]]] = Refinable()
+    choices_page_size: int = EvaluatedRefinable()
     # deprecated: the formatters should be able to handle None
     empty_choice_tuple: Tuple[Any, str, str, bool] = EvaluatedRefinable()
 
     search_fields = Refinable()
+    search_strategy: Union[str, Callable[..., QuerySet]] = Refinable()
     errors: Errors = Refinable()
 
     empty_label: str = EvaluatedRefinable()
@@ -578,6 +676,8 @@ def __init__(self, **kwargs):
         :param write_to_instance: Callback to write value to instance. Invoked with parameters field, instance and value.
         :param choice_to_option: DEPRECATED: Callback to generate the choice data given a choice value. It will get the keyword arguments `form`, `field` and `choice`. It should return a 4-tuple: `(choice, internal_value, display_name, is_selected)`
         :param choice_to_optgroup Callback to generate the optgroup for the given choice. It will get the keyword argument `choice`. It should return None if the choice should not be grouped.
+        :param choices_page_size: For `choice_queryset` with the `iommi/form/choice.html` template: only render the selected choices and the first `choices_page_size` choices into the html. The rest are loaded page by page from the `choices` endpoint. Other templates render all choices, unless they use `paged_choice_tuples` and load the rest themselves. Set to `None` to render all choices. Default: `40`
+        :param search_strategy: For `choice_queryset`: how the `choices` endpoint searches the `search_fields`. One of `ranked` (exact, then prefix, then substring matches), `prefix` (case sensitive prefix matches, which can use an index on the search fields. On PostgreSQL with a non-C locale the index needs `varchar_pattern_ops`, like the one Django adds for `CharField(db_index=True)`), `exact_first` (exact, then prefix matches) and `trigram` (trigram similarity, PostgreSQL only), a name registered with `register_search_strategy`, or a callable. Default: `ranked`
         """
 
         model_field = kwargs.get('model_field')
@@ -588,6 +688,8 @@ def __init__(self, **kwargs):
 
         # value/value_data_list is the final step that contains parsed and valid data
         self.value = None
+        self._choices_page_cache = None
+        self._choices_by_pk = None
 
         self.non_editable_input = Namespace(
             {
@@ -841,11 +943,12 @@ def _choice_to_option_shim(self, form, field, choice):
         else:
             is_selected = field.value is not None and choice in field.value
 
+        evaluate_parameters = self.iommi_evaluate_parameters()
         # The legacy structure is `(choice, id, display_name, is_selected)`
         return (
             choice,
-            self.choice_id_formatter(choice=choice, **self.iommi_evaluate_parameters()),
-            self.choice_display_name_formatter(choice=choice, **self.iommi_evaluate_parameters()),
+            self.choice_id_formatter(choice=choice, **evaluate_parameters),
+            self.choice_display_name_formatter(choice=choice, **evaluate_parameters),
             is_selected,
         )
 
@@ -859,26 +962,46 @@ def choice_to_options_selected(self):
         else:
             return [self._choice_to_option_shim(form=self.form, field=self, choice=self.value)]
 
+    def _choices_page(self):
+        # The selected choices and the first page, in the order of the choices endpoint that serves the next pages,
+        # and if there are more choices after the page
+        if self._choices_page_cache is None:
+            is_paged = isinstance(self.choices, QuerySet) and self.endpoints.get('choices')
+            if self.choices_page_size is None or not is_paged:
+                self._choices_page_cache = self.choices, False
+            else:
+                page = list(
+                    self.extra.filter_and_sort(form=self.form, field=self, value='')[: self.choices_page_size + 1]
+                )
+                selected = [x[0] for x in self.choice_to_options_selected]
+                self._choices_page_cache = (
+                    selected + [x for x in page[: self.choices_page_size] if x not in selected],
+                    len(page) > self.choices_page_size,
+                )
+        return self._choices_page_cache
+
     @property
-    def choice_tuples(self):
+    def choices_has_more(self):
+        return self._choices_page()[1]
+
+    def _choice_tuples(self, choices):
         result = []
         if not self.required and not self.is_list:
             result.append(self.empty_choice_tuple + (0,))
-        for i, choice in enumerate(self.choices):
+        for i, choice in enumerate(choices):
             result.append(self._choice_to_option_shim(form=self.form, field=self, choice=choice) + (i + 1,))
 
         return result
 
-    @property
-    def grouped_choice_tuples(self):
+    def _grouped_choice_tuples(self, choice_tuples):
         if self.choice_to_optgroup is None:
-            return [(None, self.choice_tuples)]
+            return [(None, choice_tuples)]
         else:
             groups = []
             current_group_name = None
             current_group = []
             groups.append((current_group_name, current_group))
-            for choice_tuple in self.choice_tuples:
+            for choice_tuple in choice_tuples:
                 choice = choice_tuple[0]
                 group_name = self.choice_to_optgroup(choice=choice, **self.iommi_evaluate_parameters())
                 if current_group_name != group_name:
@@ -888,6 +1011,26 @@ def grouped_choice_tuples(self):
                 current_group.append(choice_tuple)
             return groups
 
+    @property
+    def choice_tuples(self):
+        return self._choice_tuples(self.choices)
+
+    @property
+    def grouped_choice_tuples(self):
+        return self._grouped_choice_tuples(self.choice_tuples)
+
+    @property
+    def paged_choice_tuples(self):
+        """
+        Like `choice_tuples`, but for `choice_queryset` only the selected choices and the first `choices_page_size`
+        choices. Templates that use this must load the rest from the `choices` endpoint when `choices_has_more`.
+        """
+        return self._choice_tuples(self._choices_page()[0])
+
+    @property
+    def grouped_paged_choice_tuples(self):
+        return self._grouped_choice_tuples(self.paged_choice_tuples)
+
     @classmethod
     def from_model(cls, model, model_field_name=None, model_field=None, **kwargs):
         return member_from_model(
@@ -1033,6 +1176,8 @@ def boolean_tristate(cls, call_target=None, **kwargs):
         call_target__attribute="choice",
         parse=choice_queryset__parse,
         choice_id_formatter=lambda choice, **_: choice.pk,
+        choices_page_size=40,
+        search_strategy='ranked',
         endpoints__choices__func=choice_queryset__endpoint_handler,
         is_valid=choice_queryset__is_valid,
         extra__filter_and_sort=choice_queryset__extra__filter_and_sort,
@@ -52,6 +52,7 @@
     perform_ajax_dispatch,
 )
 from iommi.form import (
+    _search_strategy_by_name,
     bool_parse,
     boolean_tristate__parse,
     create_or_edit_object_redirect,
@@ -67,6 +68,7 @@
     INITIALS_FROM_GET,
     int_parse,
     register_field_factory,
+    register_search_strategy,
     render_template,
     time_parse,
     url_parse,
@@ -77,6 +79,7 @@
 from iommi.page import (
     Page,
 )
+from iommi.table import collect_queries
 from iommi.traversable import declared_members
 from tests.compat import RequestFactory
 from tests.helpers import (
@@ -1034,6 +1037,30 @@ class MyForm(Form):
     )
 
 
+@pytest.mark.django_db
+def test_choice_queryset_validates_in_one_query():
+    from django.contrib.auth.models import User
+
+    users = [User.objects.create(username=f'foo{i}') for i in range(3)]
+
+    class MyForm(Form):
+        foo = Field.choice_queryset(attr=None, choices=User.objects.all())
+        bar = Field.multi_choice_queryset(attr=None, choices=User.objects.exclude(pk=users[2].pk))
+
+    with collect_queries() as queries:
+        form = MyForm().bind(request=req('post', foo=str(users[0].pk), bar=[str(users[0].pk), str(users[1].pk)]))
+        assert form.is_valid()
+    assert form.fields.foo.value == users[0]
+    assert form.fields.bar.value == users[:2]
+    assert len(queries) == 2
+
+    form = MyForm().bind(request=req('post', foo=str(users[0].pk), bar=[str(users[1].pk), str(users[2].pk)]))
+    assert form.fields.bar._errors == {'User matching query does not exist.'}
+
+    form = MyForm().bind(request=req('post', foo='abc', bar=[]))
+    assert form.fields.foo._errors == {"Field 'id' expected a number but got 'abc'."}
+
+
 @pytest.mark.django_db
 def test_choice_queryset_do_not_cache():
     from django.contrib.auth.models import User
@@ -1094,6 +1121,56 @@ class MyForm(Form):
     assert str(BeautifulSoup(form.__html__(), "html.parser").select('select')[0]) == expected
 
 
+@pytest.mark.django_db
+def test_choice_queryset_renders_selected_and_first_page():
+    from django.contrib.auth.models import User
+
+    users = [User.objects.create(username=f'user{i}') for i in range(5)]
+
+    class MyForm(Form):
+        foo = Field.choice_queryset(
+            attr=None,
+            choices=User.objects.all(),
+            choices_page_size=2,
+            required=False,
+            input__template='iommi/form/choice.html',
+        )
+
+    form = MyForm(fields__foo__initial=users[4]).bind(request=req('get'))
+    assert form.fields.foo.choices_has_more
+    with collect_queries() as queries:
+        assert [x[1] for x in form.fields.foo.paged_choice_tuples] == ['', users[4].pk, users[0].pk, users[1].pk]
+        assert len(form.fields.foo.grouped_paged_choice_tuples[0][1]) == 4
+    assert queries == []
+    assert len(form.fields.foo.choice_tuples) == 6
+
+    soup = BeautifulSoup(form.__html__(), "html.parser")
+    assert [x.attrs['value'] for x in soup.select('option')] == ['', '5', '1', '2', '']
+    assert soup.select('option')[-1].attrs['data-iommi-more-choices'] == form.fields.foo.endpoints.choices.endpoint_path
+    assert soup.select('script')
+
+    # The next pages come from the choices endpoint, with the same page size
+    form = MyForm().bind(request=req('get', page=2))
+    actual = perform_ajax_dispatch(root=form, path='/fields/foo/endpoints/choices', value='')
+    assert [x['id'] for x in actual['results']] == [users[2].pk, users[3].pk]
+    assert actual['pagination'] == {'more': True}
+
+    # All choices are rendered when there's just one page, or when paging is turned off
+    form = MyForm(fields__foo__choices_page_size=5).bind(request=req('get'))
+    assert len(form.fields.foo.paged_choice_tuples) == 6
+    assert not form.fields.foo.choices_has_more
+    assert 'data-iommi-more-choices' not in form.__html__()
+    form = MyForm(fields__foo__choices_page_size=None).bind(request=req('get'))
+    assert len(form.fields.foo.paged_choice_tuples) == 6
+
+    # Templates without the load more control render all choices
+    form = MyForm(
+        fields__foo__input__template='iommi/form/radio.html',
+        fields__foo__extra_evaluated__id='id_foo',
+    ).bind(request=req('get'))
+    assert len(BeautifulSoup(form.__html__(), "html.parser").select('input[type="radio"]')) == 6
+
+
 @pytest.mark.django
 def test_field_from_model():
     from tests.models import Foo
@@ -1863,6 +1940,62 @@ class ChoiceQuerySetAjaxOnePastTheEndModel(models.Model):
     }
 
 
+@pytest.mark.django_db
+def test_choice_queryset_search_strategies():
+    from django.contrib.auth.models import User
+
+    User.objects.create(username='xfoo')
+    User.objects.create(username='foox')
+    User.objects.create(username='foo')
+    User.objects.create(username='bar')
+
+    def search(search_strategy):
+        form = Form(
+            fields__username=Field.choice_queryset(
+                choices=User.objects.all().order_by('-username'),
+                search_strategy=search_strategy,
+            ),
+        ).bind(request=req('get'))
+        actual = perform_ajax_dispatch(root=form, path='/fields/username/endpoints/choices', value='foo')
+        return [x['text'] for x in actual['results']]
+
+    assert search('ranked') == ['foo', 'foox', 'xfoo']
+    assert search('prefix') == ['foo', 'foox']
+    assert search('exact_first') == ['foo', 'foox']
+    assert search(lambda field, value, **_: field.choices.filter(username__endswith=value)) == ['xfoo', 'foo']
+
+    register_search_strategy('suffix', lambda field, value, **_: field.choices.filter(username__endswith=value))
+    try:
+        assert search('suffix') == ['xfoo', 'foo']
+    finally:
+        del _search_strategy_by_name['suffix']
+
+    with pytest.raises(AssertionError) as e:
+        search('does_not_exist')
+    assert str(e.value) == (
+        'Unknown search strategy does_not_exist. Available strategies: ranked, prefix, exact_first, trigram'
+    )
+
+
+@pytest.mark.django_db
+def test_choice_queryset_ajax_does_not_count():
+    from django.contrib.auth.models import User
+
+    for i in range(5):
+        User.objects.create(username=f'user{i}')
+
+    form = Form(
+        fields__username=Field.choice_queryset(choices=User.objects.all(), choices_page_size=2),
+    ).bind(request=req('get', page=3))
+    with collect_queries() as queries:
+        actual = perform_ajax_dispatch(root=form, path='/fields/username/endpoints/choices', value='user')
+
+    assert [x['text'] for x in actual['results']] == ['user4']
+    assert actual['pagination'] == {'more': False}
+    assert len(queries) == 1
+    assert 'COUNT' not in queries[0]
+
+
 @override_settings(DEBUG=True)
 def test_ajax_namespacing():
     class MyForm(Form):
@@ -24,10 +24,13 @@
 )
 from iommi.base import (
     capitalize,
+    is_static,
+    items,
     MISSING,
     NOT_BOUND_MESSAGE,
     values,
 )
+from iommi.debug import iommi_debug_on
 from iommi.evaluate import (
     evaluate_strict,
     evaluate_strict_container,
@@ -65,10 +68,45 @@
 ]
 
 
+def _render_cache_entry(fragment, rendered):
+    attrs = fragment.attrs
+    if attrs:
+        attrs = {k: dict(v) if isinstance(v, dict) else v for k, v in items(attrs)}
+    return fragment.tag, attrs, _children_key(fragment), rendered
+
+
+def _children_key(fragment):
+    # The type is included since a str and a SafeText with the same content render differently
+    return tuple((type(x), x) for x in values(fragment.children))
+
+
+def _has_static_children(fragment):
+    return all(isinstance(x, (str, int, float)) for x in values(fragment.children))
+
+
 def fragment__render(fragment, context):
     if not fragment.include:
         return ''
 
+    # Children can be replaced after bind (like the tbody of a Table), so they are checked again here. Caching a
+    # rendered part would keep it, and everything it references, alive on the declared object.
+    if not fragment._iommi_static or not _has_static_children(fragment):
+        return _fragment__render(fragment, context)
+
+    # Static fragments are rendered once and the result is stored on the declared object. The tag, attrs and children
+    # are compared to what was rendered, since they can still be changed after bind.
+    cached = getattr(fragment._declared, '_iommi_render_cache', None)
+    if cached is not None:
+        tag, attrs, children, rendered = cached
+        if tag == fragment.tag and attrs == fragment.attrs and children == _children_key(fragment):
+            return rendered
+
+    rendered = _fragment__render(fragment, context)
+    fragment._declared._iommi_render_cache = _render_cache_entry(fragment, rendered)
+    return rendered
+
+
+def _fragment__render(fragment, context):
     rendered_children = fragment.render_text_or_children(context=context)
 
     if fragment.template:
@@ -154,6 +192,8 @@ class MyPage(Page):
     tag = EvaluatedRefinable()
     template: Union[str, Template] = EvaluatedRefinable()
 
+    _iommi_static = False
+
     @reinvokable
     @dispatch(
         tag=None,
@@ -184,6 +224,15 @@ def __repr__(self):
     def on_bind(self) -> None:
         bind_members(self, name='children', unknown_types_fall_through=True)
 
+        # Checked before evaluation, when callables can still be seen. Debug mode adds the path to the attrs.
+        self._iommi_static = (
+            self.template is None
+            and is_static(self.tag)
+            and is_static(self.attrs)
+            and _has_static_children(self)
+            and not iommi_debug_on()
+        )
+
         # Fragment children are special and they can be raw str/int etc but
         # also callables. We need to evaluate them!
         children = evaluate_strict_container(self.children, **self.iommi_evaluate_parameters())
@@ -1,5 +1,7 @@
 import pytest
+from django.test import override_settings
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 
 from iommi import (
     Fragment,
@@ -249,3 +251,43 @@ def test_fragment_repr():
 def test_h_tag_callable():
     p = Page(title=lambda request, **_: request.GET['foo']).bind(request=req('get', foo='title here'))
     assert '<h1>Title here</h1>' in p.__html__()
+
+
+def test_static_fragment_render_cache():
+    f = html.div('foo', attrs__class__bar=True, attrs__title='x')
+
+    bound = f.bind(request=None)
+    assert bound._iommi_static
+    assert bound.__html__() == '<div class="bar" title="x">foo</div>'
+    assert f._iommi_render_cache[-1] == '<div class="bar" title="x">foo</div>'
+
+    # Later binds reuse the rendered html
+    f._iommi_render_cache = f._iommi_render_cache[:-1] + ('cached',)
+    assert f.bind(request=None).__html__() == 'cached'
+
+    # ...unless the fragment was changed after bind
+    bound = f.bind(request=None)
+    bound.attrs['class']['baz'] = True
+    assert bound.__html__() == '<div class="bar baz" title="x">foo</div>'
+    bound = f.bind(request=None)
+    bound.children['child'] = mark_safe('<b>foo</b>')
+    assert bound.__html__() == '<div class="bar" title="x"><b>foo</b></div>'
+    bound = f.bind(request=None)
+    bound.children['child'] = '<b>foo</b>'
+    assert bound.__html__() == '<div class="bar" title="x">&lt;b&gt;foo&lt;/b&gt;</div>'
+
+
+def test_dynamic_fragments_are_not_cached():
+    assert not html.div(lambda fragment, **_: 'foo').bind(request=None)._iommi_static
+    assert not html.div('foo', attrs__title=lambda fragment, **_: 'foo').bind(request=None)._iommi_static
+    assert not html.div(html.span('foo')).bind(request=None)._iommi_static
+    assert not Fragment(template='test_template_with_children.html').bind(request=None)._iommi_static
+
+    with override_settings(IOMMI_DEBUG=True):
+        assert not html.div('foo').bind(request=req('get'))._iommi_static
+
+
+def test_static_header_render_cache():
+    p = Page(parts__header=Header('foo'), parts__sub=Page(parts__header=Header('bar')))
+    assert p.bind(request=None).__html__() == p.bind(request=None).__html__()
+    assert '<h2>bar</h2>' in p.bind(request=None).__html__()
@@ -1,9 +1,11 @@
 import operator
+from collections.abc import Mapping
 from functools import reduce
 from typing import (
     Type,
     Union,
 )
+from weakref import WeakKeyDictionary
 
 from django.core.exceptions import (
     MultipleObjectsReturned,
@@ -11,6 +13,7 @@
 )
 from django.db.models import (
     F,
+    Manager,
     Model,
     Q,
     QuerySet,
@@ -25,6 +28,7 @@
     Keyword,
     oneOf,
     ParseException,
+    ParserElement,
     ParseResults,
     QuotedString,
     quotedString,
@@ -53,6 +57,7 @@
 )
 from iommi._web_compat import (
     render_template,
+    settings,
     Template,
     ValidationError,
 )
@@ -127,6 +132,175 @@ class QueryException(Exception):
 
 FREETEXT_SEARCH_NAME = 'freetext'
 
+
+def _iexact(value, other):
+    if isinstance(other, str):
+        return value is not None and str(value).lower() == other.lower()
+    return value == other
+
+
+# How to evaluate the lookups of a `Q` on a value in Python, for filtering lists of rows
+PREDICATE_BY_LOOKUP = {
+    'exact': lambda value, other: value == other,
+    'iexact': _iexact,
+    'contains': lambda value, other: value is not None and str(other) in str(value),
+    'icontains': lambda value, other: value is not None and str(other).lower() in str(value).lower(),
+    'startswith': lambda value, other: value is not None and str(value).startswith(str(other)),
+    'istartswith': lambda value, other: value is not None and str(value).lower().startswith(str(other).lower()),
+    'endswith': lambda value, other: value is not None and str(value).endswith(str(other)),
+    'iendswith': lambda value, other: value is not None and str(value).lower().endswith(str(other).lower()),
+    'gt': lambda value, other: value is not None and value > other,
+    'gte': lambda value, other: value is not None and value >= other,
+    'lt': lambda value, other: value is not None and value < other,
+    'lte': lambda value, other: value is not None and value <= other,
+    'in': lambda value, other: value in other,
+    'range': lambda value, other: value is not None and other[0] <= value <= other[1],
+    'isnull': lambda value, other: (value is None) == other,
+}
+
+
+def _path_getter(names):
+    """
+    Returns a function that gives the values at the path `names` in a row, as a tuple. Mappings are read with item
+    lookup and anything else with getattr. Like the ORM, a to many relation on the path is followed into each of the
+    related objects. A row that doesn't have the path gives no values, so it doesn't match.
+    """
+    getter_by_index = {}
+
+    def to_many(manager, index):
+        if index not in getter_by_index:
+            getter_by_index[index] = _path_getter(names[index:])
+        get_rest = getter_by_index[index]
+        return tuple(value for x in manager.all() for value in get_rest(x))
+
+    def get(row):
+        current = row
+        for index, name in enumerate(names):
+            if current is None:
+                return (None,)
+            if type(current) is dict:
+                if name not in current:
+                    return ()
+                current = current[name]
+            elif isinstance(current, Manager):
+                return to_many(current, index)
+            elif isinstance(current, Mapping):
+                if name not in current:
+                    return ()
+                current = current[name]
+            else:
+                try:
+                    current = getattr(current, name)
+                except AttributeError:
+                    return ()
+        if isinstance(current, Manager):
+            return tuple(current.all())
+        return (current,)
+
+    return get
+
+
+def _django_lookup_names():
+    from django.db.models import (
+        DateTimeField,
+        Field,
+    )
+
+    return set(Field.get_lookups()) | set(DateTimeField.get_lookups())
+
+
+def _lookup_predicate(lookup, other):
+    names = lookup.split('__')
+    unsupported_lookup = None
+    if len(names) > 1 and names[-1] in PREDICATE_BY_LOOKUP:
+        test = PREDICATE_BY_LOOKUP[names.pop()]
+    else:
+        test = PREDICATE_BY_LOOKUP['exact']
+        if len(names) > 1 and names[-1] in _django_lookup_names():
+            # Could still be an attribute, like `year` on a date
+            unsupported_lookup = names[-1]
+    if other is None:
+        # Like the ORM, `foo=None` means `foo__isnull=True`
+        test, other = PREDICATE_BY_LOOKUP['isnull'], True
+
+    get_values = _path_getter(names)
+    if isinstance(other, F):
+        # Comparing to another field, like `a=b` in the query language. Like in SQL, nothing is equal to NULL.
+        get_other_values = _path_getter(other.name.split('__'))
+        get_other = lambda row: next(iter(get_other_values(row)), None)
+    else:
+        get_other = lambda row: other
+
+    if unsupported_lookup is not None:
+        get_parent_values = _path_getter(names[:-1])
+
+    def predicate(row):
+        other_value = get_other(row)
+        if other_value is None:
+            return False
+        values = get_values(row)
+        if not values and unsupported_lookup is not None and any(x is not None for x in get_parent_values(row)):
+            raise QueryException(
+                f'Lookup "{unsupported_lookup}" is not supported when filtering rows in Python. '
+                f'Supported lookups: {", ".join(PREDICATE_BY_LOOKUP)}'
+            )
+        try:
+            return any(test(value, other_value) for value in values)
+        except TypeError:
+            # Values that can't be compared don't match, like comparing None or a string to a number
+            return False
+
+    return predicate
+
+
+def q_to_predicate(q: Q):
+    """
+    Compile `q` into a function that takes a row and returns if the row matches, with the semantics of
+    `QuerySet.filter`. The paths are read with item lookup on mappings and with getattr on anything else, so this works
+    on dicts and model instances as well as any other objects. Rows that don't have the path don't match. The supported
+    lookups are the ones in `PREDICATE_BY_LOOKUP`, other Django lookups raise `QueryException`.
+    """
+    predicates = [q_to_predicate(child) if isinstance(child, Q) else _lookup_predicate(*child) for child in q.children]
+
+    if not predicates:
+        return lambda row: True
+
+    if len(predicates) == 1:
+        predicate = predicates[0]
+    elif q.connector == Q.OR:
+
+        def predicate(row):
+            for p in predicates:
+                if p(row):
+                    return True
+            return False
+
+    else:
+
+        def predicate(row):
+            for p in predicates:
+                if not p(row):
+                    return False
+            return True
+
+    if q.negated:
+        return lambda row: not predicate(row)
+    return predicate
+
+
+def filter_rows(rows, q: Q):
+    """
+    Filter `rows` on `q`. Querysets are filtered in the database, everything else in Python with `q_to_predicate`.
+    """
+    if isinstance(rows, QuerySet):
+        return rows.filter(q)
+    predicate = q_to_predicate(q)
+    return [row for row in rows if predicate(row)]
+
+
+# Weak, so Query classes created on the fly don't live forever
+_grammar_by_class = WeakKeyDictionary()
+
 _filter_factory_by_django_field_type = {}
 
 
@@ -531,6 +705,24 @@ class StringValue(str):
     pass
 
 
+class Statement:
+    """
+    A parsed statement of the query language. The grammar is shared between queries, so it can't know about the
+    filters of a specific query. Statements are converted into `Q` objects by `Query._compile`.
+    """
+
+    def __init__(self, to_q_method_name, tokens):
+        self.to_q_method_name = to_q_method_name
+        self.tokens = tokens
+
+    def __repr__(self):
+        return f'<Statement {self.to_q_method_name} {self.tokens!r}>'
+
+
+def statement_parse_action(to_q_method_name):
+    return lambda tokens: Statement(to_q_method_name, list(tokens))
+
+
 def default_endpoint__errors(query, **_):
     try:
         query.get_q()
@@ -647,6 +839,7 @@ def __init__(self, *, model=None, rows=None, filters=None, _filters_dict=None, a
 
         self.query_advanced_value = None
         self.query_error = None
+        self._q = None
 
         # Here we need to remove the freetext config from kwargs because we want to
         # handle it differently from the other fields.
@@ -776,7 +969,7 @@ def filter(query, rows, **_):
             except QueryException:
                 pass
             if q:
-                rows = rows.filter(q)
+                rows = filter_rows(rows, q)
 
         return query.postprocess(rows=rows, **query.iommi_evaluate_parameters())
 
@@ -796,9 +989,8 @@ def parse_query_string(self, query_string: str) -> Q:
         query_string = query_string.strip()
         if not query_string:
             return Q()
-        parser = self._create_grammar()
         try:
-            tokens = parser.parseString(query_string, parseAll=True)
+            tokens = self._get_grammar().parseString(query_string, parseAll=True)
         except ParseException:
             raise QueryException('Invalid syntax for query')
         return self._compile(tokens)
@@ -808,6 +1000,8 @@ def _compile(self, tokens) -> Q:
         for token in tokens:
             if isinstance(token, ParseResults):
                 items.append(self._compile(token))
+            elif isinstance(token, Statement):
+                items.append(getattr(self, token.to_q_method_name)(token.tokens))
             elif isinstance(token, Q):
                 items.append(token)
             elif token in ('and', 'or'):
@@ -853,6 +1047,16 @@ def _tokens_to_rpn(tokens):
             result_q.append(stack.pop()[0])
         return result_q
 
+    def _get_grammar(self):
+        grammar = _grammar_by_class.get(type(self))
+        if grammar is None:
+            if getattr(settings, 'IOMMI_QUERY_PACKRAT', False):
+                # Packrat parsing avoids re-parsing the same sub expressions when the grammar backtracks on nested
+                # expressions. Pyparsing can only turn it on for all grammars in the process, so it's opt in.
+                ParserElement.enablePackrat()
+            grammar = _grammar_by_class[type(self)] = self._create_grammar()
+        return grammar
+
     def _create_grammar(self):
         """
         Pyparsing implementation of a where clause grammar based on http://pyparsing.wikispaces.com/file/view/simpleSQL.py
@@ -870,6 +1074,9 @@ def _create_grammar(self):
         Example
         something < 10 AND other >= 2015-01-01 AND (foo < 1 OR bar > 1)
 
+        The grammar is created once per class and shared between its queries, so the parse actions must not depend on
+        a specific query. They produce `Statement` objects that are converted to `Q` objects with the filters of the
+        query in `_compile`.
         """
         quoted_string_excluding_quotes = QuotedString('"', escChar='\\').setParseAction(
             lambda token: StringValue(token[0])
@@ -886,9 +1093,13 @@ def _create_grammar(self):
 
         # Define a where expression
         where_expression = Forward()
-        binary_operator_statement = (identifier + binary_op + value_string).setParseAction(self._binary_op_to_q)
-        unary_operator_statement = (identifier | (Char('!') + identifier)).setParseAction(self._unary_op_to_q)
-        free_text_statement = quotedString.copy().setParseAction(self._freetext_to_q)
+        binary_operator_statement = (identifier + binary_op + value_string).setParseAction(
+            statement_parse_action('_binary_op_to_q')
+        )
+        unary_operator_statement = (identifier | (Char('!') + identifier)).setParseAction(
+            statement_parse_action('_unary_op_to_q')
+        )
+        free_text_statement = quotedString.copy().setParseAction(statement_parse_action('_freetext_to_q'))
         operator_statement = binary_operator_statement | free_text_statement | unary_operator_statement
         where_condition = Group(operator_statement | ('(' + where_expression + ')'))
         where_expression << where_condition + ZeroOrMore((and_ | or_) + where_expression)
@@ -1032,13 +1243,15 @@ def expr(field, is_list, value):
 
     def get_q(self):
         """
-        Create a query set based on the data in the request.
+        Create a query set based on the data in the request. The result is cached on the bound query.
         """
-        try:
-            return self.parse_query_string(self.get_query_string())
-        except QueryException as e:
-            self.query_error = str(e)
-            raise
+        if self._q is None:
+            try:
+                self._q = self.parse_query_string(self.get_query_string())
+            except QueryException as e:
+                self.query_error = str(e)
+                raise
+        return self._q
 
     @classmethod
     @dispatch(
@@ -40,10 +40,12 @@
     build_query_expression,
     choice_queryset_value_to_q,
     Filter,
+    filter_rows,
     FREETEXT_SEARCH_NAME,
     Q_OPERATOR_BY_QUERY_OPERATOR,
     Query,
     QueryException,
+    q_to_predicate,
     value_to_str_for_query,
 )
 from iommi.traversable import declared_members
@@ -203,6 +205,41 @@ def test_request_to_q_advanced(MyTestQuery):
     )
 
 
+def test_grammar_is_shared_and_q_is_cached(MyTestQuery):
+    query = MyTestQuery().bind(
+        request=req('get', **{'-query': 'foo_name="asd" and (bar_name = 7 or baz_name = 11)'})
+    )
+    other_query = MyTestQuery().bind(request=None)
+    assert query._get_grammar() is other_query._get_grammar()
+    assert query._get_grammar() is not Query().bind(request=None)._get_grammar()
+
+    q = query.get_q()
+    assert query.get_q() is q
+
+    # The shared grammar still uses the filters of each query
+    class OtherQuery(Query):
+        foo_name = Filter(attr='other_foo', query_operator_for_field='=')
+
+    assert repr(OtherQuery().bind(request=None).parse_query_string('foo_name="asd"')) == repr(
+        Q(**{'other_foo__iexact': 'asd'})
+    )
+    assert repr(other_query.parse_query_string('foo_name="asd"')) == repr(Q(**{'foo__iexact': 'asd'}))
+
+
+def test_create_grammar_override_gets_the_query(MyTestQuery):
+    seen = []
+
+    class GrammarQuery(MyTestQuery):
+        def _create_grammar(self):
+            seen.append(self)
+            return super(GrammarQuery, self)._create_grammar()
+
+    query = GrammarQuery().bind(request=None)
+    assert repr(query.parse_query_string('foo_name="asd"')) == repr(Q(**{'foo__iexact': 'asd'}))
+    GrammarQuery().bind(request=None).parse_query_string('foo_name="asd"')
+    assert seen == [query]
+
+
 @pytest.mark.django_db
 def test_boolean_filter():
     for i in range(3):
@@ -414,6 +451,104 @@ def test_null(MyTestQuery):
     assert repr(query.parse_query_string('foo_name=null')) == repr(Q(**{'foo': None}))
 
 
+def test_q_to_predicate():
+    rows = [
+        Struct(name='Foo', n=1, d=date(2020, 1, 1), other=Struct(name='foo')),
+        Struct(name='bar', n=2, d=None, other=Struct(name='x')),
+        Struct(name=None, n=3, d=date(2021, 1, 1), other=None),
+    ]
+
+    def matching(q):
+        return [rows.index(x) for x in filter_rows(rows, q)]
+
+    assert matching(Q()) == [0, 1, 2]
+    assert matching(Q(name='Foo')) == [0]
+    assert matching(Q(name__exact='foo')) == []
+    assert matching(Q(name__iexact='foo')) == [0]
+    assert matching(Q(name__contains='a')) == [1]
+    assert matching(Q(name__icontains='O')) == [0]
+    assert matching(Q(name__startswith='b')) == [1]
+    assert matching(Q(name__istartswith='F')) == [0]
+    assert matching(Q(name__endswith='o')) == [0]
+    assert matching(Q(name__iendswith='R')) == [1]
+    assert matching(Q(n__gt=1)) == [1, 2]
+    assert matching(Q(n__gte=2)) == [1, 2]
+    assert matching(Q(n__lt=2)) == [0]
+    assert matching(Q(n__lte=2)) == [0, 1]
+    assert matching(Q(n__in=[1, 3])) == [0, 2]
+    assert matching(Q(n__range=(2, 3))) == [1, 2]
+    assert matching(Q(d__lt=date(2020, 6, 1))) == [0]
+    assert matching(Q(d__year=2021)) == [2]
+    assert matching(Q(d=None)) == [1]
+    assert matching(Q(d__isnull=False)) == [0, 2]
+    assert matching(Q(n__gt='a')) == []
+    assert matching(Q(other__name__iexact='FOO')) == [0]
+    assert matching(Q(name__iexact=F('other__name'))) == [0]
+    assert matching(~Q(name__iexact='foo')) == [1, 2]
+    assert matching(~Q()) == [0, 1, 2]
+    assert matching(Q(n=1) | Q(n=3)) == [0, 2]
+    assert matching(Q(n__gt=1) & Q(name__isnull=True)) == [2]
+    assert matching(Q(n=1) | (Q(n__gt=1) & ~Q(name='bar'))) == [0, 2]
+
+    assert q_to_predicate(Q(n=2))(rows[1]) is True
+
+    # Rows without the attribute don't match
+    assert q_to_predicate(Q(name__icontains='a'))(Struct(other=1)) is False
+    assert q_to_predicate(Q(other__name__isnull=True))(Struct(other=Struct())) is False
+    assert q_to_predicate(~Q(name='a'))(Struct(other=1)) is True
+
+
+def test_q_to_predicate_on_mappings():
+    rows = [
+        dict(name='foo', other=dict(n=1)),
+        dict(name='bar', other=dict(n=2)),
+        dict(other=None),
+    ]
+    assert filter_rows(rows, Q(name__icontains='O')) == rows[:1]
+    assert filter_rows(rows, Q(other__n__gt=1)) == rows[1:2]
+    assert filter_rows(rows, Q(other__n=None)) == rows[2:]
+    assert filter_rows(rows, Q(name__isnull=True)) == []
+
+    # Lookups we can't evaluate in Python are errors, unless they are a key of the row
+    with pytest.raises(QueryException) as e:
+        filter_rows(rows, Q(name__regex='^f'))
+    assert str(e.value).startswith('Lookup "regex" is not supported when filtering rows in Python. Supported lookups: ')
+    assert filter_rows([dict(d=dict(year=2020))], Q(d__year=2020)) == [dict(d=dict(year=2020))]
+
+
+@pytest.mark.django_db
+def test_q_to_predicate_to_many():
+    foos = [TFoo.objects.create(a=i, b=str(i)) for i in range(3)]
+    baz = TBaz.objects.create()
+    baz.foo.set(foos[1:])
+    other_baz = TBaz.objects.create()
+
+    assert filter_rows([baz, other_baz], Q(foo=foos[2])) == [baz]
+    assert filter_rows([baz, other_baz], Q(foo__a__lt=1)) == []
+    assert filter_rows([baz, other_baz], ~Q(foo=foos[0])) == [baz, other_baz]
+    assert filter_rows(TBaz.objects.all(), Q(foo=foos[2])).query.where
+
+
+def test_query_on_list(MyTestQuery):
+    rows = [
+        Struct(foo='a', bar='b', baz='c'),
+        Struct(foo='b', bar='B', baz='c'),
+        Struct(foo='c', bar='b', baz='d'),
+    ]
+
+    def filtered(query_string):
+        query = MyTestQuery(rows=rows).bind(request=req('get', **{'-query': query_string}))
+        return [rows.index(x) for x in query.filter(query=query, rows=rows)]
+
+    assert filtered('') == [0, 1, 2]
+    assert filtered('foo_name=A') == [0]
+    assert filtered('bar_name=b') == [0, 2]
+    assert filtered('bar_name=b and baz_name=D') == [2]
+    assert filtered('foo_name=bar_name') == [1]
+    assert filtered('"B"') == [1]
+    assert filtered('foo_name!=a') == [1, 2]
+
+
 def test_date_out_of_range():
     class MyTestQuery(Query):
         foo = Filter.date()
@@ -77,3 +77,6 @@ def set_and_remember_for_reinvoke(obj, **kwargs):
         setattr(obj, k, v)
         # noinspection PyProtectedMember
         obj._iommi_saved_params[k] = v
+    if getattr(obj, '_iommi_frozen', False):
+        # The styled prototypes are now out of date
+        obj._iommi_frozen_prototypes = {}
@@ -110,12 +110,26 @@ def __init__(
         self.root = {k: v for k, v in items(Namespace(*(base.root for base in bases), root)) if v is not None}
         self.config = Namespace(*[x.config for x in bases], recursive_namespace(kwargs))
 
+        # The style data only depends on the class, the shortcut stack and is_root of the object, so we calculate
+        # it once for each combination instead of for every bind
+        self._component_cache = {}
+
     def component(self, obj, is_root=False):
         """
         Calculate the namespace of additional argument that should be applied
         to the given object. If is_root is set to True, assets might also be
         added to the namespace.
         """
+        key = (type(obj), tuple(getattr(obj, '__tri_declarative_shortcut_stack', [])), is_root)
+        result = self._component_cache.get(key)
+        if result is None:
+            result = self._component_cache[key] = self._calculate_component(obj, is_root)
+        if not result:
+            # Fast path: most objects have no style config at all
+            return Namespace()
+        return Namespace(result)
+
+    def _calculate_component(self, obj, is_root):
         result = Namespace()
 
         # TODO: is this wrong? Should it take classes first, then loop through shortcuts?
@@ -111,6 +111,33 @@ def shortcut2(cls, call_target, **kwargs):
     assert items(b) == dict(foo=4, bar=7)
 
 
+def test_style_component_cache():
+    class A(Traversable):
+        @dispatch
+        @reinvokable
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+
+        foo = Refinable()
+
+        @classmethod
+        @class_shortcut
+        def shortcut1(cls, call_target, **kwargs):
+            return call_target(**kwargs)
+
+    style = Style(A=dict(foo=1, shortcuts__shortcut1__foo=2))
+
+    assert style.component(A()) == dict(foo=1)
+    assert style.component(A()) == dict(foo=1)
+    assert style.component(A.shortcut1()) == dict(foo=2)
+    assert style.component(Traversable()) == {}
+    assert len(style._component_cache) == 3
+
+    # Modifying the result does not modify the cache
+    style.component(A())['foo'] = 3
+    assert style.component(A()) == dict(foo=1)
+
+
 def test_apply_checkbox_style():
     from iommi import Form
     from iommi import Field
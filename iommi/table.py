@@ -1,4 +1,14 @@
-import csv
+import copy
+import heapq
+import json
+import warnings
+from base64 import (
+    urlsafe_b64decode,
+    urlsafe_b64encode,
+)
+from collections import Counter
+from collections.abc import Sequence
+from contextlib import contextmanager
 from datetime import (
     date,
     datetime,
@@ -8,8 +18,11 @@
     auto,
     Enum,
 )
-from functools import total_ordering
-from io import StringIO
+from functools import (
+    lru_cache,
+    total_ordering,
+)
+from hashlib import sha1
 from itertools import groupby
 from math import ceil
 from typing import (
@@ -21,18 +34,37 @@
     Type,
     Union,
 )
-from urllib.parse import quote_plus
+from uuid import uuid4
 
+from django.core.cache import (
+    caches,
+    DEFAULT_CACHE_ALIAS,
+)
+from django.core.exceptions import (
+    EmptyResultSet,
+    FieldDoesNotExist,
+)
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import (
+    connections,
+    DEFAULT_DB_ALIAS,
+    transaction,
+)
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+)
 from django.db.models import (
     AutoField,
     BooleanField,
+    F,
     ManyToManyField,
     Model,
+    Q,
     QuerySet,
 )
-from django.http import (
-    FileResponse,
-)
+from django.db.models.query import ModelIterable
 from django.utils.formats import date_format
 from django.utils.html import (
     conditional_escape,
@@ -69,7 +101,6 @@
     HttpResponseRedirect,
     mark_safe,
     render_template,
-    smart_str,
     Template,
 )
 from iommi.action import (
@@ -83,6 +114,7 @@
     render_attrs,
 )
 from iommi.base import (
+    attr_getter,
     build_as_view_wrapper,
     capitalize,
     get_display_name,
@@ -93,6 +125,7 @@
     NOT_BOUND_MESSAGE,
     values,
 )
+from iommi.debug import iommi_debug_on
 from iommi.endpoint import (
     DISPATCH_PREFIX,
     path_join,
@@ -100,7 +133,15 @@
 from iommi.evaluate import (
     evaluate,
     evaluate_member,
+    evaluate_members,
     evaluate_strict,
+    evaluate_strict_container,
+    signature_from_kwargs,
+)
+from iommi.export import (
+    CsvWriter,
+    export_response,
+    get_export_writer_class,
 )
 from iommi.form import (
     Field,
@@ -134,6 +175,7 @@
     declared_members,
     evaluated_refinable,
     EvaluatedRefinable,
+    is_evaluated_refinable,
     set_declared_member,
     Traversable,
 )
@@ -205,37 +247,124 @@ def prepare_headers(table):
             column.is_sorting = False
 
 
+def ordered_by_on_list(objects, order_field, is_desc=False):
+    """
+    Utility function to sort objects django-style even for non-query set collections
+
+    :param objects: list of objects to sort
+    :param order_field: field name, follows django conventions, so `foo__bar` means `foo.bar` and `-foo` means descending, can be a callable. Can also be a list of these, to sort on several keys.
+    :param is_desc: reverse the sorting
+    :return: a sorted sequence
+    """
+    objects = list(objects)
+    keys_by_field = order_keys(objects, order_field, is_desc)
+    return [objects[i] for i in sorted_indexes(keys_by_field, len(objects))]
+
+
+def order_keys(objects, order_fields, is_desc=False):
+    """
+    Calculate the sort keys of `objects` up front, once per object and order field. Returns a list of `(keys,
+    is_desc)`, one per order field. `None` sorts before all other values.
+    """
+    if not isinstance(order_fields, (list, tuple)):
+        order_fields = [order_fields]
+
+    result = []
+    for order_field in order_fields:
+        field_is_desc = is_desc
+        if callable(order_field):
+            getter = order_field
+        else:
+            if order_field.startswith('-'):
+                order_field = order_field[1:]
+                field_is_desc = not field_is_desc
+            getter = attr_getter(order_field)
+        result.append(([(v is not None, v) for v in map(getter, objects)], field_is_desc))
+    return result
+
+
 @total_ordering
-class MinType(object):
-    def __le__(self, other):
-        return True
+class Descending:
+    __slots__ = ('value',)
 
-    def __eq__(self, other):
-        return self is other
+    def __init__(self, value):
+        self.value = value
 
+    def __lt__(self, other):
+        return other.value < self.value
 
-MIN = MinType()
+    def __eq__(self, other):
+        return self.value == other.value
 
 
-def ordered_by_on_list(objects, order_field, is_desc=False):
+def sorted_indexes(keys_by_field, count, limit=None):
     """
-    Utility function to sort objects django-style even for non-query set collections
+    The indexes of the objects in sorted order, given the `keys_by_field` from `order_keys`. With `limit` only the
+    first `limit` indexes are returned, found with `heapq` instead of sorting everything.
+    """
+    indexes = range(count)
+    if limit is not None and limit < count:
+        directions = {field_is_desc for _, field_is_desc in keys_by_field}
+        if len(directions) == 1:
+            key_list = [keys for keys, _ in keys_by_field]
+            select = heapq.nlargest if directions.pop() else heapq.nsmallest
+        else:
+            key_list = [
+                [Descending(k) for k in keys] if field_is_desc else keys for keys, field_is_desc in keys_by_field
+            ]
+            select = heapq.nsmallest
+        keys = key_list[0] if len(key_list) == 1 else list(zip(*key_list))
+        # Same result and stability as sorted(...)[:limit]
+        return select(limit, indexes, key=keys.__getitem__)
 
-    :param objects: list of objects to sort
-    :param order_field: field name, follows django conventions, so `foo__bar` means `foo.bar`, can be a callable.
-    :param is_desc: reverse the sorting
-    :return: a sorted sequence
+    # Stable sorts from the least significant key to the most significant
+    for keys, field_is_desc in reversed(keys_by_field):
+        indexes = sorted(indexes, key=keys.__getitem__, reverse=field_is_desc)
+    return list(indexes)
+
+
+class LazilySortedList(Sequence):
     """
-    if callable(order_field):
-        return sorted(objects, key=order_field, reverse=is_desc)
+    The objects of a list in sorted order. Until the whole list is needed, slicing out a page only orders the
+    objects up to the end of that page (with `heapq`), so paging through a big in memory list doesn't sort all of
+    it on each request.
+    """
+
+    def __init__(self, objects, order_fields, is_desc=False):
+        self.objects = objects
+        self.order_fields = order_fields
+        self.is_desc = is_desc
+        self._keys_by_field = None
+        self._sorted = None
+
+    def _indexes(self, limit=None):
+        if self._keys_by_field is None:
+            self._keys_by_field = order_keys(self.objects, self.order_fields, self.is_desc)
+        return sorted_indexes(self._keys_by_field, len(self.objects), limit=limit)
+
+    def sorted(self):
+        if self._sorted is None:
+            self._sorted = [self.objects[i] for i in self._indexes()]
+        return self._sorted
 
-    def order_key(x):
-        v = getattr_path(x, order_field)
-        if v is None:
-            return MIN
-        return v
+    def __len__(self):
+        return len(self.objects)
 
-    return sorted(objects, key=order_key, reverse=is_desc)
+    def __iter__(self):
+        return iter(self.sorted())
+
+    def __getitem__(self, index):
+        if self._sorted is None and isinstance(index, slice) and index.step is None:
+            start, stop, _ = index.indices(len(self.objects))
+            if stop < len(self.objects):
+                return [self.objects[i] for i in self._indexes(limit=stop)[start:stop]]
+        return self.sorted()[index]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {self.sorted()!r}>'
 
 
 def yes_no_formatter(value, **_):
@@ -308,6 +437,79 @@ def default_cell__value(column, row, **kwargs):
         return getattr_path(row, evaluate_strict(column.attr, row=row, column=column, **kwargs))
 
 
+def needed_fields(model, attrs):
+    """
+    Returns the names of the fields of `model` that need to be fetched to read `attrs` from an instance, or `None` if
+    we can't tell because an attr isn't a model field.
+    """
+    result = {model._meta.pk.name}
+    for attr in attrs:
+        name = attr.split('__')[0]
+        if name == 'pk':
+            continue
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+        if field.concrete and not field.many_to_many:
+            result.add(field.name)
+        elif not (field.many_to_many or field.one_to_many or field.one_to_one):
+            # For example a GenericForeignKey, which reads other fields
+            return None
+        # Many to many and reverse relations are fetched by separate queries that only need the primary key
+
+    return result
+
+
+@lru_cache(maxsize=None)
+def _relation_by_attribute_name(model):
+    # Reverse relations are reached through their accessor (`foo_set`), not the query name `get_field` expects
+    result = {}
+    for field in model._meta.get_fields():
+        if not field.is_relation or field.related_model is None:
+            continue
+        if field.auto_created and not field.concrete:
+            result[field.get_accessor_name()] = field
+        else:
+            result[field.name] = field
+    return result
+
+
+def infer_related_lookups(model, attr):
+    """
+    Returns a tuple of the `select_related` and `prefetch_related` lookup needed to read `attr` from instances of
+    `model` without one query per row. Forward foreign keys (and one to ones) are joined with `select_related`, and
+    the first many to many or reverse foreign key on the path is fetched with `prefetch_related`.
+    """
+    path = []
+    for name in attr.split('__'):
+        field = _relation_by_attribute_name(model).get(name)
+        if field is None:
+            break
+        if field.many_to_many or field.one_to_many:
+            return '__'.join(path) or None, '__'.join(path + [name])
+        path.append(name)
+        model = field.related_model
+
+    return '__'.join(path) or None, None
+
+
+def only_needed_fields(rows, attrs):
+    """
+    Apply `.only()` to the queryset `rows` with the fields needed to read `attrs`. Querysets that already have
+    deferred fields, or that aren't querysets of model instances, are returned untouched.
+    """
+    if rows.query.deferred_loading != (frozenset(), True) or rows._iterable_class is not ModelIterable:
+        return rows
+
+    fields = needed_fields(rows.model, attrs)
+    if fields is None:
+        return rows
+
+    return rows.only(*sorted(fields))
+
+
 class DataRetrievalMethods(Enum):
     attribute_access = auto()
     prefetch = auto()
@@ -588,7 +790,7 @@ def my_handler(table):
 
         def cell__value(row, table, cells, **kwargs):
             checked_str = ' checked' if evaluate_strict(checked, row=row, **kwargs) else ''
-            if isinstance(table.rows, QuerySet):
+            if isinstance(table.sorted_and_filtered_rows, QuerySet):
                 row_id = row.pk
             else:
                 # row_index is the visible row number
@@ -860,14 +1062,11 @@ def __html__(self):
         if self.template:
             return render_template(self.iommi_parent().get_request(), self.template, self.iommi_evaluate_parameters())
 
-        return (
-            Fragment(
-                tag=self.tag,
-                attrs=self.attrs,
-                children__text=mark_safe('\n'.join(bound_cell.__html__() for bound_cell in self)),
-            )
-            .bind(parent=self)
-            .__html__()
+        return format_html(
+            '{}{}{}',
+            self.iommi_open_tag(),
+            mark_safe('\n'.join(bound_cell.__html__() for bound_cell in self)),
+            self.iommi_close_tag(),
         )
 
     def __str__(self):
@@ -899,12 +1098,8 @@ class CellConfig(RefinableObject, Tag):
 class Cell(CellConfig):
     @dispatch
     def __init__(self, cells: Cells, column):
-        kwargs = setdefaults_path(
-            Namespace(),
-            column.cell,
-            column.table.cell,
-        )
-        super(Cell, self).__init__(**kwargs)
+        plan = cells.iommi_parent()._row_render_plan.cell_render_plan(column)
+        super(Cell, self).__init__(**plan.kwargs)
         self._name = 'cell'
         self._parent = cells
         self._is_bound = True
@@ -917,13 +1112,26 @@ def __init__(self, cells: Cells, column):
         self.row = cells.row
 
         self._evaluate_parameters = {**self.cells.iommi_evaluate_parameters(), 'column': column}
-
-        self.value = evaluate_strict(self.value, **self._evaluate_parameters)
+        if plan.value_getter is not None:
+            self.value = plan.value_getter(self.row)
+        else:
+            if plan.signature_without_value is None:
+                plan.signature_without_value = signature_from_kwargs(self._evaluate_parameters)
+            self.value = evaluate_strict(
+                self.value, __signature=plan.signature_without_value, **self._evaluate_parameters
+            )
         self._evaluate_parameters['value'] = self.value
-        self.url = evaluate_strict(self.url, **self._evaluate_parameters)
-        self.attrs = evaluate_attrs(self, **self._evaluate_parameters)
-        self.url_title = evaluate_strict(self.url_title, **self._evaluate_parameters)
-        self.tag = evaluate_strict(self.tag, **self._evaluate_parameters)
+        if plan.signature is None:
+            plan.signature = signature_from_kwargs(self._evaluate_parameters)
+        signature = plan.signature
+
+        if plan.dynamic_url:
+            self.url = evaluate_strict(self.url, __signature=signature, **self._evaluate_parameters)
+        self.attrs = plan.evaluate_attrs(self)
+        if plan.dynamic_url_title:
+            self.url_title = evaluate_strict(self.url_title, __signature=signature, **self._evaluate_parameters)
+        if plan.dynamic_tag:
+            self.tag = evaluate_strict(self.tag, __signature=signature, **self._evaluate_parameters)
 
     @property
     def iommi_dunder_path(self):
@@ -951,6 +1159,10 @@ def render_cell_contents(self):
         url = self.url
         if url:
             url_title = self.url_title
+            if not self.link:
+                # Fast path for the common case: no link config means we don't need a full Fragment
+                return format_html('<a{}>{}</a>', render_attrs(dict(href=url, title=url_title)), cell_contents)
+
             # TODO: `url`, `url_title` and `link` is overly complex
             cell_contents = (
                 Fragment(tag='a', attrs__title=url_title, attrs__href=url, children__content=cell_contents, **self.link)
@@ -977,6 +1189,123 @@ def get_request(self):
         return self.cells.get_request()
 
 
+def has_no_callables(value):
+    """
+    Returns True if `value` is guaranteed to evaluate to itself, i.e. it
+    contains no callables. Dicts (like `attrs`) are checked recursively.
+    """
+    if isinstance(value, dict):
+        return all(has_no_callables(v) for v in values(value))
+    return not callable(value)
+
+
+class CellRenderPlan:
+    """
+    Internal class holding the compiled render plan for the cells of one
+    column. The merge of `column.cell` and `table.cell` is done once, and the
+    parts that are static are only evaluated for the first cell.
+    """
+
+    def __init__(self, column):
+        self.kwargs = setdefaults_path(
+            Namespace(),
+            column.cell,
+            column.table.cell,
+        )
+        self.dynamic_url = not has_no_callables(self.kwargs.get('url'))
+        self.dynamic_url_title = not has_no_callables(self.kwargs.get('url_title'))
+        self.dynamic_tag = not has_no_callables(self.kwargs.get('tag'))
+        self.static_attrs = has_no_callables(self.kwargs.get('attrs'))
+        self.attrs = MISSING
+        # For the common case of a plain attribute column the value can be read directly from the row
+        self.value_getter = None
+        if self.kwargs.get('value') is default_cell__value and (column.attr is None or isinstance(column.attr, str)):
+            self.value_getter = attr_getter(column.attr)
+        # The evaluate parameter names are the same for all cells of a column, before and after `value` is added
+        self.signature_without_value = None
+        self.signature = None
+
+    def evaluate_attrs(self, cell):
+        if self.attrs is not MISSING:
+            return self.attrs
+
+        attrs = evaluate_attrs(cell, __signature=self.signature, **cell.iommi_evaluate_parameters())
+        if self.static_attrs:
+            self.attrs = attrs
+        return attrs
+
+
+class RowRenderPlan:
+    """
+    Internal class implementing the compile step of row rendering. It is
+    created when the `Table` is bound and analyses which parts of the row
+    and cell config are static. Rows are then bound without the full
+    `Traversable.bind` machinery, only evaluating the dynamic parts.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        # Cells is not reinvokable, so there is no style to apply. This means
+        # we can skip the full bind and copy a prototype for each row instead.
+        self.prototype = Cells(row=None, row_index=None, **table.row.as_dict())
+
+        self.dynamic_members = [
+            k
+            for k, v in items(self.prototype.get_declared('refinable_members'))
+            if is_evaluated_refinable(v) and not has_no_callables(getattr(self.prototype, k))
+        ]
+        self.static_attrs = has_no_callables(self.prototype.attrs)
+        self.attrs = MISSING
+        self.dynamic_extra_evaluated = not has_no_callables(self.prototype.extra_evaluated or {})
+        # The evaluate parameter names are the same for all rows
+        self.signature = None
+        self._cell_render_plans = {}
+
+    def cell_render_plan(self, column):
+        plan = self._cell_render_plans.get(column._name)
+        if plan is None:
+            plan = CellRenderPlan(column)
+            self._cell_render_plans[column._name] = plan
+        return plan
+
+    def invalidate(self, column):
+        self._cell_render_plans.pop(column._name, None)
+
+    def bind_cells(self, row, row_index):
+        cells = copy.copy(self.prototype)
+        cells.row = row
+        cells.row_index = row_index
+        cells._declared = self.prototype
+        cells._parent = self.table
+        cells._bound_members = Struct()
+        cells._is_bound = True
+        evaluate_parameters = {
+            **self.table.iommi_evaluate_parameters(),
+            **cells.own_evaluate_parameters(),
+            'traversable': cells,
+        }
+        cells._evaluate_parameters = evaluate_parameters
+        if self.signature is None:
+            self.signature = signature_from_kwargs(evaluate_parameters)
+        cells._evaluate_parameters_signature = signature = self.signature
+
+        if self.attrs is not MISSING:
+            cells.attrs = self.attrs
+        else:
+            cells.attrs = evaluate_attrs(cells, __signature=signature, **evaluate_parameters)
+            if self.static_attrs:
+                self.attrs = cells.attrs
+
+        evaluate_members(cells, self.dynamic_members, __signature=signature, **evaluate_parameters)
+
+        if self.dynamic_extra_evaluated:
+            cells.extra_evaluated = evaluate_strict_container(
+                cells.extra_evaluated, __signature=signature, **evaluate_parameters
+            )
+
+        return cells
+
+
 class TemplateConfig(RefinableObject):
     template: str = Refinable()
 
@@ -1056,6 +1385,43 @@ def iommi_dunder_path(self):
         return path_join(self.column.iommi_dunder_path, self._name, separator='__')
 
 
+def chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def bulk_set_m2m(queryset, pks, values_by_model_field, batch_size):
+    """
+    Set many-to-many fields of the objects in `queryset` with the given pks, like `.set()` does for one object.
+    Relations that are removed are deleted with one query per field, and the new ones are added with `bulk_create`.
+    Like `QuerySet.update()` this sends no `m2m_changed` or `post_save` signals. Fields with a custom through model,
+    and symmetrical fields, are set one object at a time.
+    """
+    per_object = {}
+    for model_field, related in items(values_by_model_field):
+        through = model_field.remote_field.through
+        if not through._meta.auto_created or model_field.remote_field.symmetrical:
+            per_object[model_field.name] = related
+            continue
+
+        source = through._meta.get_field(model_field.m2m_field_name()).attname
+        target = through._meta.get_field(model_field.m2m_reverse_field_name()).attname
+        target_pks = {x.pk for x in related}
+        rows = through.objects.using(queryset.db).filter(**{f'{source}__in': pks})
+        rows.exclude(**{f'{target}__in': target_pks}).delete()
+        existing = set(rows.values_list(source, target))
+        through.objects.using(queryset.db).bulk_create(
+            [through(**{source: s, target: t}) for s in pks for t in target_pks if (s, t) not in existing],
+            batch_size=batch_size,
+        )
+
+    if per_object:
+        for obj in queryset.filter(pk__in=pks):
+            for name, related in items(per_object):
+                getattr(obj, name).set(related)
+            obj.save()
+
+
 def bulk__post_handler(table, form, **_):
     if not form.is_valid():
         return
@@ -1073,39 +1439,96 @@ def bulk__post_handler(table, form, **_):
             continue
 
         if isinstance(field.model_field, ManyToManyField):
+            assert '__' not in field.attr, "Nested m2m relations is currently not supported for bulk editing"
             m2m_updates.append(field)
         else:
             simple_updates.append(field)
 
     updates = {field.attr: field.value for field in simple_updates}
-    queryset.update(**updates)
+    m2m_values = {field.model_field: field.value for field in m2m_updates}
 
-    if m2m_updates:
-        for obj in queryset:
-            for field in m2m_updates:
-                assert '__' not in field.attr, "Nested m2m relations is currently not supported for bulk editing"
-                getattr(obj, field.attr).set(field.value)
-            obj.save()
+    if table.bulk_batch_size is None:
+        queryset.update(**updates)
+
+        if m2m_updates:
+            for obj in queryset:
+                for field in m2m_updates:
+                    getattr(obj, field.attr).set(field.value)
+                obj.save()
+    else:
+        # Update bulk_batch_size objects at a time, each batch in its own transaction
+        pks = list(queryset.values_list('pk', flat=True))
+        manager = queryset.model._default_manager.using(queryset.db)
+        for chunk in chunks(pks, table.bulk_batch_size):
+            with transaction.atomic(using=queryset.db):
+                if updates:
+                    manager.filter(pk__in=chunk).update(**updates)
+                bulk_set_m2m(queryset, chunk, m2m_values, batch_size=table.bulk_batch_size)
+
+    # update() sends no signals, so the cached counts and pages of tables on the model are thrown away explicitly
+    for model, cache_alias in list(_invalidated_table_caches):
+        if model is queryset.model:
+            invalidate_table_cache(model, cache_alias=cache_alias)
 
     table.post_bulk_edit(queryset=queryset, updates=updates, **table.iommi_evaluate_parameters())
 
     return HttpResponseRedirect(form.get_request().META['HTTP_REFERER'])
 
 
+def delete_in_batches(queryset, batch_size):
+    """
+    Delete the objects in `queryset` `batch_size` objects at a time, each batch in its own transaction, so that
+    cascades only load one batch of objects into memory. Yields the number of deleted objects and the total after
+    each batch. If the delete is interrupted, only whole batches have been deleted.
+    """
+    pks = list(queryset.values_list('pk', flat=True))
+    manager = queryset.model._default_manager.using(queryset.db)
+    deleted = 0
+    for chunk in chunks(pks, batch_size):
+        with transaction.atomic(using=queryset.db):
+            manager.filter(pk__in=chunk).delete()
+        deleted += len(chunk)
+        yield deleted, len(pks)
+
+
 def bulk_delete__post_handler(table, form, **_):
     if not form.is_valid():
         return
 
     queryset = table.bulk_queryset()
 
+    request = form.get_request()
+    # We need to remove the target for the old delete button that we pressed to get here,
+    # otherwise ConfirmPage will give an error saying it can't find that button
+    request.POST = request.POST.copy()
+    del request.POST[form.actions.delete.own_target_marker()]
+
     from iommi.page import (
         Page,
     )
 
+    def confirm_count(page, **_):
+        paginator = page.parts.confirm.paginator
+        return paginator.count if paginator.page_size is not None else len(paginator.rows)
+
+    # When deleting everything, only the first page is shown. The paginator links are GET requests that would lose
+    # the POST with the selection, so the paginator only says how many items are not shown.
+    if table._selection_identifiers() == 'all':
+        page_size = table.page_size or DEFAULT_PAGE_SIZE
+    else:
+        page_size = None
+
     class ConfirmPage(Page):
-        title = html.h1(gettext_lazy('Are you sure you want to delete these {} items?').format(queryset.count()))
+        title = html.h1(
+            lambda page, **_: gettext('Are you sure you want to delete these {} items?').format(confirm_count(page))
+        )
         confirm = Table(
             auto__rows=queryset,
+            page_size=page_size,
+            parts__page__template=Template(
+                '{% load i18n %}'
+                '<p>{% blocktrans %}Showing the first {{ page_size }} of {{ hits }} items.{% endblocktrans %}</p>'
+            ),
             columns__select=dict(
                 include=True,
                 checked=True,
@@ -1124,17 +1547,19 @@ class ConfirmPage(Page):
             ),
         )
 
-    request = form.get_request()
-    # We need to remove the target for the old delete button that we pressed to get here,
-    # otherwise ConfirmPage will give an error saying it can't find that button
-    request.POST = request.POST.copy()
-    del request.POST[form.actions.delete.own_target_marker()]
-
     p = ConfirmPage().bind(request=request)
 
     if request.POST.get(p.parts.confirm.bulk.fields.confirmed.iommi_path) == 'confirmed':
-        queryset.delete()
-        return HttpResponseRedirect(form.get_request().META['HTTP_REFERER'])
+        if table.bulk_batch_size is None:
+            queryset.delete()
+        else:
+            for deleted_count, total_count in delete_in_batches(queryset, table.bulk_batch_size):
+                table.on_bulk_delete_progress(
+                    deleted_count=deleted_count,
+                    total_count=total_count,
+                    **table.iommi_evaluate_parameters(),
+                )
+        return HttpResponseRedirect(request.META['HTTP_REFERER'])
 
     return HttpResponse(render_root(part=p))
 
@@ -1148,6 +1573,310 @@ def paginator__count(rows, **_):
         return None
 
 
+class CappedCount(int):
+    """
+    A count that was cut off at a limit. It behaves like the limit in calculations, but renders as for example "1000+".
+    """
+
+    def __str__(self):
+        return f'{int(self)}+'
+
+
+def capped_count(limit=1000):
+    """
+    Count strategy for `Paginator.count` that stops counting after `limit` rows, by counting a `LIMIT limit + 1` subquery. If there are more rows the count is a `CappedCount`, and the paginator only shows the pages up to the limit.
+
+    Usage: `Table(parts__page__count=capped_count(limit=1000))`
+    """
+
+    def count(rows, **kwargs):
+        if not isinstance(rows, QuerySet):
+            return paginator__count(rows=rows, **kwargs)
+        result = rows[: limit + 1].count()
+        return CappedCount(limit) if result > limit else result
+
+    count.cache_key = f'capped_count:{limit}'
+    return count
+
+
+def _is_unfiltered(rows):
+    query = rows.query
+    return not query.where and not query.distinct and not query.is_sliced and query.group_by is None
+
+
+def estimated_count(threshold=10000):
+    """
+    Count strategy for `Paginator.count` that uses the query planner statistics for the table (`pg_class.reltuples`) instead of `COUNT(*)` for unfiltered querysets on PostgreSQL. The estimate is only used if it's above `threshold`, since small tables are cheap to count exactly and their statistics are less reliable. Filtered querysets and other databases fall back to an exact count.
+
+    Usage: `Table(parts__page__count=estimated_count())`
+    """
+
+    def count(rows, **kwargs):
+        if isinstance(rows, QuerySet) and _is_unfiltered(rows):
+            connection = connections[rows.db]
+            if connection.vendor == 'postgresql':
+                # regclass parses the name like SQL does, so mixed case and schema qualified names must be quoted
+                table_name = connection.ops.quote_name(rows.model._meta.db_table)
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [table_name])
+                    row = cursor.fetchone()
+                if row is not None and row[0] > threshold:
+                    return int(row[0])
+        return paginator__count(rows=rows, **kwargs)
+
+    count.cache_key = f'estimated_count:{threshold}'
+    return count
+
+
+def table_cache_version(model, cache_alias=DEFAULT_CACHE_ALIAS):
+    """
+    The current version of the cached counts and pages of tables on `model`. It's part of the cache keys, so
+    changing it with `invalidate_table_cache` makes all the cached entries stale at once.
+    """
+    return caches[cache_alias].get_or_set(f'iommi-table-cache-version:{model._meta.label}', lambda: uuid4().hex, None)
+
+
+def invalidate_table_cache(model, cache_alias=DEFAULT_CACHE_ALIAS):
+    """
+    Throw away the cached counts and pages of tables on `model`. This is done automatically when an instance of
+    `model` is saved or deleted, or its many-to-many relations change. Call this yourself when rows change in other
+    ways, like `QuerySet.update()`, or when the tables also show data from other models.
+    """
+    caches[cache_alias].set(f'iommi-table-cache-version:{model._meta.label}', uuid4().hex, None)
+
+
+_invalidated_table_caches = set()
+
+
+def _invalidate_table_cache_on_change(model, cache_alias):
+    if (model, cache_alias) in _invalidated_table_caches:
+        return
+    _invalidated_table_caches.add((model, cache_alias))
+
+    def invalidate(sender, **_):
+        invalidate_table_cache(sender, cache_alias=cache_alias)
+
+    def invalidate_on_m2m_change(sender, instance, **kwargs):
+        # Sent by the through model, with the model on the other side of the relation in `model`
+        if isinstance(instance, model) or issubclass(kwargs['model'], model):
+            invalidate_table_cache(model, cache_alias=cache_alias)
+
+    dispatch_uid = f'iommi-table-cache:{model._meta.label}:{cache_alias}'
+    post_save.connect(invalidate, sender=model, weak=False, dispatch_uid=dispatch_uid)
+    post_delete.connect(invalidate, sender=model, weak=False, dispatch_uid=dispatch_uid)
+    m2m_changed.connect(invalidate_on_m2m_change, weak=False, dispatch_uid=dispatch_uid)
+
+
+def _table_cache_key(prefix, rows, cache_alias, *extra):
+    # The compiled SQL covers the model, filters and ordering of rows. Returns None when rows can't match anything.
+    try:
+        sql, params = rows.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    _invalidate_table_cache_on_change(rows.model, cache_alias)
+    version = table_cache_version(rows.model, cache_alias=cache_alias)
+    return f'{prefix}:' + sha1(repr((version, rows.db, sql, params, extra)).encode()).hexdigest()
+
+
+def cached_count(timeout=60, count=paginator__count, cache_alias=DEFAULT_CACHE_ALIAS):
+    """
+    Count strategy for `Paginator.count` that stores the result of `count` in the Django cache for `timeout` seconds. The cache key is built from the compiled SQL and parameters of the queryset, so different filters get different counts, and from the `cache_key` attribute (or name) of `count`. Counts of non-queryset rows are not cached. Saving or deleting an instance of the model, or changing its many-to-many relations, invalidates the cached counts, see `invalidate_table_cache`.
+
+    Usage: `Table(parts__page__count=cached_count(timeout=300))` or combined with another strategy: `cached_count(count=capped_count(limit=1000))`
+    """
+
+    def cached(rows, **kwargs):
+        if not isinstance(rows, QuerySet):
+            return count(rows=rows, **kwargs)
+        count_key = getattr(count, 'cache_key', None) or f'{count.__module__}.{count.__qualname__}'
+        key = _table_cache_key('iommi-count', rows, cache_alias, count_key)
+        if key is None:
+            return 0
+        cache = caches[cache_alias]
+        result = cache.get(key)
+        if result is None:
+            result = count(rows=rows, **kwargs)
+            cache.set(key, (int(result), isinstance(result, CappedCount)), timeout)
+        else:
+            value, is_capped = result
+            result = CappedCount(value) if is_capped else value
+        return result
+
+    return cached
+
+
+def cached_page(timeout=60, cache_alias=DEFAULT_CACHE_ALIAS):
+    """
+    Slice strategy for `Paginator.slice` that stores the primary keys of the rows on each page in the Django cache for `timeout` seconds. On a cache hit the rows are fetched with the filtering and sorting of the queryset plus a filter on the cached primary keys, so only the `OFFSET`/`LIMIT` scan of deep pages is skipped. The cache key is built from the compiled SQL of the queryset and the page bounds, so different filters, sort orders, pages and page sizes are cached separately. Saving or deleting an instance of the model, or changing its many-to-many relations, invalidates the cached pages, see `invalidate_table_cache`.
+
+    Usage: `Table(parts__page__slice=cached_page(timeout=300), parts__page__count=cached_count(timeout=300))`
+    """
+
+    def cached(rows, bottom, top, **_):
+        if not isinstance(rows, QuerySet):
+            return rows[bottom:top]
+        key = _table_cache_key('iommi-page', rows, cache_alias, bottom, top)
+        if key is None:
+            return []
+        cache = caches[cache_alias]
+        pks = cache.get(key)
+        if pks is None:
+            page = list(rows[bottom:top])
+            cache.set(key, [x.pk for x in page], timeout)
+            return page
+
+        row_by_pk = {x.pk: x for x in rows.filter(pk__in=pks)}
+        return [row_by_pk[pk] for pk in pks if pk in row_by_pk]
+
+    return cached
+
+
+KEYSET_NEXT = 'n'
+KEYSET_PREVIOUS = 'p'
+
+
+class KeysetPaginationException(Exception):
+    pass
+
+
+def _keyset_field(model, name):
+    """
+    Returns a tuple of the name to compare on and if the value can be `None`. Ordering on a foreign key orders on
+    the key column, so we compare and encode that column (`foo_id`) instead of the related object.
+    """
+    if name == 'pk':
+        return name, False
+
+    field = None
+    nullable = False
+    for x in name.split('__'):
+        if field is not None:
+            if field.related_model is None:
+                return name, True
+            model = field.related_model
+        try:
+            field = model._meta.get_field(x)
+        except FieldDoesNotExist:
+            # Annotations and such
+            return name, True
+        nullable = nullable or field.null
+
+    if not field.is_relation:
+        return name, nullable
+
+    if not field.concrete or field.many_to_many:
+        raise KeysetPaginationException(f'Keyset pagination can not order on {name}, since it can have many rows')
+
+    related_meta = field.related_model._meta
+    if list(related_meta.ordering) not in ([], ['pk'], [related_meta.pk.name]):
+        raise KeysetPaginationException(
+            f'Keyset pagination can not order on {name}, since it orders on the ordering of '
+            f'{related_meta.object_name}. Order on the fields of {related_meta.object_name} instead.'
+        )
+
+    return name[: -len(field.name)] + field.attname, nullable
+
+
+def keyset_ordering(rows):
+    """
+    Returns the ordering of the queryset `rows` as a list of (field name, is descending, is nullable) tuples,
+    with pk added last as a tie breaker if needed.
+    """
+    ordering = list(rows.query.order_by)
+    if not ordering and rows.query.default_ordering:
+        ordering = list(rows.model._meta.ordering)
+
+    result = []
+    for x in ordering:
+        if not isinstance(x, str) or x == '?':
+            raise KeysetPaginationException(
+                f'Keyset pagination only supports ordering on fields, got {x!r}. '
+                f'Order on field names (like "-foo") or turn keyset pagination off.'
+            )
+        is_desc = x.startswith('-')
+        name, nullable = _keyset_field(rows.model, x[1:] if is_desc else x)
+        result.append((name, is_desc, nullable))
+
+    if not any(name in ('pk', rows.model._meta.pk.name) for name, _, _ in result):
+        result.append(('pk', False, False))
+
+    return result
+
+
+def _ordering_strings(ordering):
+    return [('-' if is_desc else '') + name for name, is_desc, _ in ordering]
+
+
+def keyset_order_by(ordering, forward):
+    """
+    The arguments to `order_by` for reading forward (or backward if `forward` is False). `None` sorts as larger
+    than any other value on all databases, so the order matches the filter from `keyset_q`.
+    """
+    result = []
+    for name, is_desc, nullable in ordering:
+        if is_desc == forward:
+            result.append(F(name).desc(nulls_first=True) if nullable else '-' + name)
+        else:
+            result.append(F(name).asc(nulls_last=True) if nullable else name)
+    return result
+
+
+def encode_keyset_cursor(direction, ordering, row):
+    values = [getattr_path(row, name) for name, _, _ in ordering]
+    data = json.dumps([_ordering_strings(ordering), values], cls=DjangoJSONEncoder)
+    return direction + '.' + urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_keyset_cursor(cursor, ordering):
+    """
+    Returns a tuple of direction and the values of the ordering fields. If the cursor
+    is missing, invalid or was created for another ordering we start from the beginning.
+    """
+    if not cursor:
+        return None, None
+    try:
+        direction, token = cursor.split('.', 1)
+        cursor_ordering, values = json.loads(urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        return None, None
+
+    if direction not in (KEYSET_NEXT, KEYSET_PREVIOUS) or cursor_ordering != _ordering_strings(ordering):
+        return None, None
+    if not isinstance(values, list) or len(values) != len(ordering):
+        return None, None
+
+    return direction, values
+
+
+def keyset_q(ordering, values, forward):
+    """
+    The filter for all rows after (or before if `forward` is False) the row with the given values, i.e.
+    `(a > x) OR (a = x AND b > y) OR ...` with the comparisons flipped for descending fields. `None` is
+    larger than any other value, like in `keyset_order_by`.
+    """
+    result = Q(pk__in=[])
+    equal = Q()
+    for (name, is_desc, nullable), value in zip(ordering, values):
+        if is_desc != forward:
+            # Larger values
+            if value is None:
+                beyond = None
+            elif nullable:
+                beyond = Q(**{f'{name}__gt': value}) | Q(**{f'{name}__isnull': True})
+            else:
+                beyond = Q(**{f'{name}__gt': value})
+        else:
+            # Smaller values
+            if value is None:
+                beyond = Q(**{f'{name}__isnull': False})
+            else:
+                beyond = Q(**{f'{name}__lt': value})
+        if beyond is not None:
+            result |= equal & beyond
+        equal &= Q(**{f'{name}__isnull': True}) if value is None else Q(**{name: value})
+    return result
+
+
 class Paginator(Traversable):
     attrs: Attrs = Refinable()  # attrs is evaluated, but in a special way so gets no EvaluatedRefinable type
     template: Union[str, Template] = EvaluatedRefinable()
@@ -1164,6 +1893,7 @@ class Paginator(Traversable):
     count: int = Refinable()  # count is evaluated, but in a special way so gets no EvaluatedRefinable type
     slice = Refinable()
     show_always = Refinable()
+    keyset: bool = Refinable()
 
     @dispatch(
         adjacent_pages=6,
@@ -1184,9 +1914,13 @@ class Paginator(Traversable):
             max(1, (paginator.count - (paginator.min_page_size - 1))) / paginator.page_size
         ),
         slice=lambda top, bottom, rows, **_: rows[bottom:top],
+        keyset=False,
     )
     @reinvokable
     def __init__(self, **kwargs):
+        """
+        :param keyset: Set to `True` to use keyset (seek) pagination. Instead of numbered pages, the paginator shows next/previous links with a cursor built from the values of the sort columns and pk of the last (or first) row on the page. Each page is then an index range scan regardless of how deep you are, and no `COUNT(*)` is needed. Only works for querysets ordered on fields. `None` values of the sort columns sort as larger than any other value. A foreign key in the ordering is compared on its key column, so the related model must be ordered on its primary key (or not at all).
+        """
         super(Paginator, self).__init__(**kwargs)
         self.context = None
         self.page_size = None
@@ -1205,6 +1939,11 @@ def on_bind(self) -> None:
         self.link.attrs = evaluate_attrs(self.link)
 
         rows = table.sorted_and_filtered_rows
+
+        if self.keyset and self.page_size is not None and rows is not None:
+            self._bind_keyset(request=request, rows=rows)
+            return
+
         evaluate_parameters = dict(
             page_size=self.page_size,
             rows=rows,
@@ -1282,11 +2021,62 @@ def on_bind(self) -> None:
             }
         )
 
+    def _bind_keyset(self, request, rows):
+        assert isinstance(rows, QuerySet), 'Keyset pagination only works on querysets'
+
+        ordering = keyset_ordering(rows)
+        direction, values = decode_keyset_cursor(request.GET.get(self.iommi_path) if request else None, ordering)
+        forward = direction != KEYSET_PREVIOUS
+
+        if values is not None:
+            rows = rows.filter(keyset_q(ordering, values, forward=forward))
+        rows = rows.order_by(*keyset_order_by(ordering, forward=forward))
+
+        # Fetch one extra row to know if there are more rows in this direction
+        page = list(rows[: self.page_size + 1])
+        has_more = len(page) > self.page_size
+        page = page[: self.page_size]
+        if not forward:
+            page.reverse()
+
+        has_next = bool(page) and (has_more if forward else True)
+        has_previous = bool(page) and (values is not None if forward else has_more)
+
+        self.rows = page
+        self.count = None
+        self.number_of_pages = None
+        self.page = None
+
+        get = params_of_request(request)
+        if self.iommi_path in get:
+            del get[self.iommi_path]
+
+        self.context = self.iommi_evaluate_parameters().copy()
+        self.context.update(
+            {
+                'extra': get and (get.urlencode() + "&") or "",
+                'page_numbers': [],
+                'show_first': has_previous,
+                'show_last': False,
+                'page_size': self.page_size,
+                'has_next': has_next,
+                'has_previous': has_previous,
+                'next': encode_keyset_cursor(KEYSET_NEXT, ordering, page[-1]) if has_next else None,
+                'previous': encode_keyset_cursor(KEYSET_PREVIOUS, ordering, page[0]) if has_previous else None,
+                'page': None,
+                'pages': None,
+                'hits': None,
+                'paginator': self,
+            }
+        )
+
     def own_evaluate_parameters(self):
         return dict(paginator=self)
 
     def is_paginated(self):
         assert self._is_bound, NOT_BOUND_MESSAGE
+        if self.keyset and self.number_of_pages is None:
+            return self.context['has_next'] or self.context['has_previous']
         return self.number_of_pages > 1
 
     def __html__(self):
@@ -1295,7 +2085,7 @@ def __html__(self):
             if self.page_size is None:
                 return ''
 
-            if self.number_of_pages <= 1:
+            if not self.is_paginated():
                 return ''
 
         return render_template(
@@ -1313,62 +2103,34 @@ class TableAutoConfig(AutoConfig):
 
 
 def endpoint__csv(table, **_):
-    columns = [c for c in values(table.columns) if c.extra_evaluated.get('report_name')]
-    csv_safe_column_indexes = {i for i, c in enumerate(values(table.columns)) if 'csv_whitelist' in c.extra}
-    assert columns, 'To get CSV output you must specify at least one column with extra_evaluated__report_name'
-    assert (
-        'report_name' in table.extra_evaluated
-    ), 'To get CSV output you must specify extra_evaluated__report_name on the table'
-    filename = table.extra_evaluated.report_name + '.csv'
-
-    header = [c.extra_evaluated.report_name for c in columns]
-
-    def smart_text2(s):
-        if s is None:
-            return ''
-        elif isinstance(s, float):
-            result = ('%f' % s).strip('0')
-            if result[-1] == '.':
-                result += '0'
-            return result
-        else:
-            assert not isinstance(s, bytes)
-            return str(s).strip()
+    return export_response(table=table, writer_class=CsvWriter)
 
-    def safe_csv_value(value):
-        # CSV formula injection protection: http://georgemauer.net/2017/10/07/csv-injection.html
-        if value and value[0] in ('+', '-', '@', '='):
-            return '\t' + value
-        else:
-            return value
 
-    def cell_value(cells, bound_column):
-        value = Cell(cells, bound_column).value
-        return bound_column.extra_evaluated.get('report_value', value)
+def endpoint__export(table, value, **_):
+    """
+    Export the table in the format given as the value, e.g. `?/export=xlsx`.
+    See `export_response` for how to configure the export.
+    """
+    return export_response(table=table, writer_class=get_export_writer_class(value))
 
-    def rows():
-        for cells in table.cells_for_rows():
-            yield [cell_value(cells, bound_column) for bound_column in columns]
 
-    def write_csv_row(writer, row):
-        row_strings = [smart_text2(value) for value in row]
-        safe_row = [v if i in csv_safe_column_indexes else safe_csv_value(v) for i, v in enumerate(row_strings)]
-        writer.writerow(safe_row)
+class RepeatedQueriesWarning(UserWarning):
+    pass
 
-    f = StringIO()
-    writer = csv.writer(f)
-    writer.writerow(header)
-    for row in rows():
-        write_csv_row(writer, row)
 
-    response = FileResponse(f.getvalue(), 'text/csv')
+@contextmanager
+def collect_queries(using=DEFAULT_DB_ALIAS):
+    """
+    Collect the SQL of all queries run in the block. Queries that only differ in the parameters have the same SQL.
+    """
+    queries = []
 
-    # RFC 2183, RFC 2184
-    response['Content-Disposition'] = smart_str(
-        "attachment; filename*=UTF-8''{value}".format(value=quote_plus(filename))
-    )
-    response['Last-Modified'] = datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
-    return response
+    def wrapper(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connections[using].execute_wrapper(wrapper):
+        yield queries
 
 
 class _Lazy_tbody:
@@ -1376,6 +2138,26 @@ def __init__(self, table):
         self.table = table
 
     def __html__(self):
+        if not iommi_debug_on():
+            return self._render()
+
+        # In debug mode we look for queries that are run for each row, which means a select_related or
+        # prefetch_related is missing
+        rows = self.table.sorted_and_filtered_rows
+        using = rows.db if isinstance(rows, QuerySet) else DEFAULT_DB_ALIAS
+        with collect_queries(using=using) as queries:
+            result = self._render()
+
+        number_of_rows = len(self.table.visible_rows)
+        if number_of_rows > 1:
+            for sql, count in Counter(queries).items():
+                if count >= number_of_rows:
+                    self.table.on_repeated_queries(
+                        sql=sql, count=count, number_of_rows=number_of_rows, **self.table.iommi_evaluate_parameters()
+                    )
+        return result
+
+    def _render(self):
         return mark_safe('\n'.join([cells.__html__() for cells in self.table.cells_for_rows()]))
 
 
@@ -1399,8 +2181,11 @@ class Meta:
 
     bulk_filter: Namespace = EvaluatedRefinable()
     bulk_exclude: Namespace = EvaluatedRefinable()
+    bulk_batch_size: Optional[int] = EvaluatedRefinable()
     sortable: bool = EvaluatedRefinable()
     query_from_indexes: bool = Refinable()
+    infer_related_lookups: bool = Refinable()
+    only_needed_fields: bool = Refinable()
     default_sort_order = Refinable()
     attrs: Attrs = Refinable()  # attrs is evaluated, but in a special way so gets no EvaluatedRefinable type
     template: Union[str, Template] = EvaluatedRefinable()
@@ -1445,6 +2230,7 @@ class Meta:
         page_class = Page
         endpoints__tbody__func = lambda table, **_: {'html': table.__html__(template='iommi/table/table_tag.html')}
         endpoints__csv__func = endpoint__csv
+        endpoints__export__func = endpoint__export
 
         attrs = Namespace(
             {
@@ -1473,12 +2259,35 @@ def preprocess_row(table, row, **_):
     def post_bulk_edit(table, queryset, updates, **_):
         pass
 
+    @staticmethod
+    @refinable
+    def on_bulk_delete_progress(table, deleted_count, total_count, **_):
+        """
+        Called after each batch of a bulk delete when `bulk_batch_size` is set.
+        """
+        pass
+
+    @staticmethod
+    @refinable
+    def on_repeated_queries(table, sql, count, number_of_rows, **_):
+        """
+        Called in debug mode when rendering the rows of the table ran the same SQL (with different parameters) at
+        least once per row, which usually means that a `select_related` or `prefetch_related` is missing.
+        """
+        warnings.warn(
+            f'Rendering {number_of_rows} rows of {table!r} ran the same query {count} times: {sql}',
+            category=RepeatedQueriesWarning,
+        )
+
     @reinvokable
     @dispatch(
         columns=EMPTY,
         bulk_filter={},
         bulk_exclude={},
+        bulk_batch_size=None,
         sortable=True,
+        infer_related_lookups=True,
+        only_needed_fields=False,
         default_sort_order=None,
         template='iommi/table/table.html',
         tbody__call_target=Fragment,
@@ -1545,7 +2354,10 @@ def __init__(
         :param row__template: name of template (or `Template` object) to use for rendering the row
         :param bulk_filter: filters to apply to the `QuerySet` before performing the bulk operation
         :param bulk_exclude: exclude filters to apply to the `QuerySet` before performing the bulk operation
+        :param bulk_batch_size: set this to perform bulk edits `bulk_batch_size` objects at a time with one `QuerySet.update()` per batch, and to write the rows of many-to-many through tables directly with `bulk_create` and deletes, each batch in its own transaction. The batched edits send no `post_save` or `m2m_changed` signals and don't update `auto_now` fields. By default the simple fields are changed with a single `QuerySet.update()` and many-to-many fields with `.set()` and `save()` per object. Bulk deletes are also done `bulk_batch_size` objects at a time, instead of with a single `QuerySet.delete()`, and `on_bulk_delete_progress` is called after each batch.
         :param sortable: set this to `False` to turn off sorting for all columns
+        :param infer_related_lookups: set this to `False` to turn off adding `select_related`/`prefetch_related` for the relations the `attr` of columns with the default `data_retrieval_method` go through
+        :param only_needed_fields: set this to `True` to only fetch the database fields used by the `attr` of the columns (and the primary key), via `QuerySet.only()`. If a column has an `attr` that isn't a model field, like a property, all fields are fetched. Note that any other field your callables read from the row will be fetched with one query per row, so only turn this on for tables that only show plain attributes.
         """
         select_conf = columns.get('select', {})
         if 'select' not in _columns_dict and isinstance(select_conf, dict):
@@ -1597,6 +2409,7 @@ def __init__(
         self.sorted_rows = None
         self.sorted_and_filtered_rows = None
         self._visible_rows = None
+        self._row_render_plan = None
 
         collect_members(self, name='actions', items=actions, cls=self.get_meta().action_class)
         collect_members(self, name='columns', items=columns, items_dict=_columns_dict, cls=self.get_meta().member_class)
@@ -1618,7 +2431,9 @@ def add_hidden_all_pks_field(declared_bulk_fields):
             )
 
         form_class = self.get_meta().form_class
-        if self.model:
+        # Tables on lists get a query when they have filters, which is then evaluated in memory
+        # x.filter.include can be a callable here. We treat that as truthy on purpose.
+        if self.model or any(x.filter.include for x in values(declared_members(self).columns)):
             # Query
             filters = Struct()
 
@@ -1649,6 +2464,7 @@ def add_hidden_all_pks_field(declared_bulk_fields):
             )
             declared_members(self).query = self.query
 
+        if self.model:
             # Bulk
             field_class = self.get_meta().form_class.get_meta().member_class
 
@@ -1782,13 +2598,6 @@ def on_bind(self) -> None:
 
         evaluate_member(self, 'model', strict=False, **self.iommi_evaluate_parameters())
         evaluate_member(self, 'initial_rows', **self.iommi_evaluate_parameters())
-        self._prepare_sorting()
-
-        if not self.sortable:
-            # TODO: we could do this on the unbound stuff instead. This is bad because it triggers _bind_all()
-            for column in values(self.columns):
-                # Special case for entire table not sortable
-                column.sortable = False
 
         # If the column is not included, the down stream query filters and bulk fields should also be gone
         declared_query_filters = (
@@ -1804,7 +2613,16 @@ def on_bind(self) -> None:
                 if name in declared_bulk_fields:
                     set_and_remember_for_reinvoke(declared_bulk_fields[name], include=False)
 
+        # Filter before sorting, so we only sort the rows that are left
         self._bind_query()
+        self._prepare_sorting()
+
+        if not self.sortable:
+            # TODO: we could do this on the unbound stuff instead. This is bad because it triggers _bind_all()
+            for column in values(self.columns):
+                # Special case for entire table not sortable
+                column.sortable = False
+
         self._bind_bulk_form()
         self._bind_headers()
 
@@ -1819,18 +2637,37 @@ def on_bind(self) -> None:
                 for x in values(self.columns)
                 if x.data_retrieval_method == DataRetrievalMethods.select and x.attr
             ]
+            if self.infer_related_lookups:
+                for x in values(self.columns):
+                    if x.data_retrieval_method == DataRetrievalMethods.attribute_access and x.attr:
+                        inferred_select, inferred_prefetch = infer_related_lookups(
+                            self.sorted_and_filtered_rows.model, x.attr
+                        )
+                        if inferred_select and inferred_select not in select:
+                            select.append(inferred_select)
+                        if inferred_prefetch and inferred_prefetch not in prefetch:
+                            prefetch.append(inferred_prefetch)
+
             if prefetch:
                 self.sorted_and_filtered_rows = self.sorted_and_filtered_rows.prefetch_related(*prefetch)
             if select:
                 self.sorted_and_filtered_rows = self.sorted_and_filtered_rows.select_related(*select)
 
+            if self.only_needed_fields:
+                self.sorted_and_filtered_rows = only_needed_fields(
+                    self.sorted_and_filtered_rows,
+                    attrs=[x.attr for x in values(self.columns) if x.attr],
+                )
+
         self.bulk_container = self.bulk_container.bind(parent=self)
 
+        self._row_render_plan = RowRenderPlan(self)
+
     def _bind_query(self):
         """
         Bind the query form and apply it.
         """
-        self.sorted_and_filtered_rows = self.sorted_rows
+        self.sorted_and_filtered_rows = self.initial_rows
 
         if self.query is None:
             return
@@ -1849,10 +2686,10 @@ def _bind_query(self):
 
         if self.query is not None:
             self.sorted_and_filtered_rows = self.query.filter(
-                query=self.query, rows=self.sorted_rows, **self.iommi_evaluate_parameters()
+                query=self.query, rows=self.initial_rows, **self.iommi_evaluate_parameters()
             )
         else:
-            self.sorted_and_filtered_rows = self.sorted_rows
+            self.sorted_and_filtered_rows = self.initial_rows
 
     def _bind_bulk_form(self):
         if self.bulk is None:
@@ -1925,15 +2762,16 @@ def auto_rowspan_style(row, **_):
                 if 'style' not in column.cell.attrs:
                     column.cell.attrs['style'] = {}
                 column.cell.attrs['style']['display'] = auto_rowspan_style
+                self._row_render_plan.invalidate(column)
 
     def _prepare_sorting(self):
-        """Sort all the rows.
+        """Sort `sorted_and_filtered_rows` according to the `order` parameter of the request.
 
-        self.sorted_rows = sorted(self.initial_rows)
+        The query is applied before this, so `sorted_rows` holds the same filtered and sorted rows as
+        `sorted_and_filtered_rows`. Lists are sorted lazily with a `LazilySortedList`, so showing a page only orders
+        the rows up to the end of that page.
         """
-        # TODO: Sorting less values is faster then sorting more values, so we should
-        # filter first and then sort.
-        self.sorted_rows = self.initial_rows
+        self.sorted_rows = self.sorted_and_filtered_rows
         request = self.get_request()
         if request is None:
             return
@@ -1950,11 +2788,14 @@ def _prepare_sorting(self):
             order_args = isinstance(order_args, list) and order_args or [order_args]
 
             if sort_column.sortable:
-                if isinstance(self.initial_rows, list):
-                    self.sorted_rows = ordered_by_on_list(self.initial_rows, order_args[0], is_desc)
+                rows = self.sorted_and_filtered_rows
+                if isinstance(rows, QuerySet):
+                    if is_desc:
+                        order_args = [x[1:] if x.startswith('-') else '-' + x for x in order_args]
+                    rows = rows.order_by(*order_args)
                 else:
-                    order_args = ["%s%s" % (is_desc and '-' or '', x) for x in order_args]
-                    self.sorted_rows = self.initial_rows.order_by(*order_args)
+                    rows = LazilySortedList(list(rows), order_fields=order_args, is_desc=is_desc)
+                self.sorted_rows = self.sorted_and_filtered_rows = rows
 
     def _bind_headers(self):
         prepare_headers(self)
@@ -2006,13 +2847,19 @@ def _bind_headers(self):
     def own_evaluate_parameters(self):
         return dict(table=self)
 
-    def cells_for_rows(self):
-        """Yield a Cells instance for each visible row on the screen."""
+    def cells_for_rows(self, rows=None):
+        """Yield a Cells instance for each visible row on the screen.
+
+        Pass `rows` to iterate over other rows than the visible ones, e.g. all the
+        `sorted_and_filtered_rows` when exporting.
+        """
         assert self._is_bound, NOT_BOUND_MESSAGE
-        rows = self.preprocess_rows(rows=self.visible_rows, **self.iommi_evaluate_parameters())
+        if rows is None:
+            rows = self.visible_rows
+        rows = self.preprocess_rows(rows=rows, **self.iommi_evaluate_parameters())
         for i, row in enumerate(rows):
             row = self.preprocess_row(table=self, row=row)
-            yield Cells(row=row, row_index=i, **self.row.as_dict()).bind(parent=self)
+            yield self._row_render_plan.bind_cells(row=row, row_index=i)
 
     @classmethod
     @dispatch(
@@ -2055,7 +2902,6 @@ def selection(self):
         """
         identifiers = self._selection_identifiers()
         if identifiers == 'all':
-            print('inside all', self.sorted_and_filtered_rows)
             return self.sorted_and_filtered_rows
         else:
             if isinstance(self.sorted_and_filtered_rows, QuerySet):
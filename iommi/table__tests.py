@@ -8,7 +8,12 @@
 
 import django
 import pytest
-from django.db.models import QuerySet
+from bs4 import BeautifulSoup
+from django.db.models import (
+    F,
+    Q,
+    QuerySet,
+)
 from django.http import HttpResponse
 from django.test import override_settings
 from tri_declarative import (
@@ -53,11 +58,26 @@
     SQL_DEBUG_LEVEL_ALL,
 )
 from iommi.table import (
+    attr_getter,
     bulk_delete__post_handler,
+    cached_count,
+    cached_page,
+    capped_count,
+    CappedCount,
+    collect_queries,
     Column,
     datetime_formatter,
+    estimated_count,
+    infer_related_lookups,
+    invalidate_table_cache,
+    KeysetPaginationException,
+    LazilySortedList,
+    keyset_ordering,
+    keyset_q,
+    needed_fields,
     ordered_by_on_list,
     register_cell_formatter,
+    RepeatedQueriesWarning,
     Struct,
     Table,
     yes_no_formatter,
@@ -943,13 +963,75 @@ def test_bulk_edit_for_m2m_relations():
     baz = TBaz.objects.create()
     baz.foo.set([f1, f2])
 
+    from django.db.models.signals import m2m_changed
+
+    changed = []
+
+    def on_m2m_changed(instance, action, **_):
+        changed.append((instance, action))
+
     t = Table(
         auto__model=TBaz,
         columns__foo__bulk__include=True,
     ).bind(request=req('post', _all_pks_='1', **{'bulk/foo': [f1.pk], '-bulk/submit': ''}))
-    t.render_to_response()
+    m2m_changed.connect(on_m2m_changed, sender=TBaz.foo.through)
+    try:
+        t.render_to_response()
+    finally:
+        m2m_changed.disconnect(on_m2m_changed, sender=TBaz.foo.through)
     baz.refresh_from_db()
     assert list(baz.foo.all()) == [f1]
+    # By default the objects are changed one at a time, with signals
+    assert changed == [(baz, 'pre_remove'), (baz, 'post_remove')]
+
+
+@pytest.mark.django_db
+def test_bulk_edit_for_m2m_relations_writes_in_batches():
+    f1 = TFoo.objects.create(a=1, b='a')
+    f2 = TFoo.objects.create(a=2, b='b')
+    bazs = [TBaz.objects.create() for _ in range(5)]
+    for baz in bazs:
+        baz.foo.set([f1])
+
+    t = Table(
+        auto__model=TBaz,
+        columns__foo__bulk__include=True,
+        bulk_batch_size=10,
+    ).bind(request=req('post', _all_pks_='1', **{'bulk/foo': [f2.pk], '-bulk/submit': ''}))
+    with collect_queries() as queries:
+        t.render_to_response()
+
+    # The pks, then deleting the removed relations, reading the kept ones and inserting the added ones, in a transaction
+    assert len([x for x in queries if not x.startswith(('SAVEPOINT', 'RELEASE SAVEPOINT'))]) == 4
+    assert [list(baz.foo.all()) for baz in bazs] == [[f2]] * 5
+
+
+@pytest.mark.django_db
+def test_bulk_edit_with_bulk_batch_size():
+    foos = [TFoo.objects.create(a=i, b='') for i in range(5)]
+    baz = TBaz.objects.create()
+    post_bulk_edit_calls = []
+
+    t = Table(
+        auto__model=TFoo,
+        columns__b__bulk__include=True,
+        bulk_batch_size=2,
+        post_bulk_edit=lambda queryset, updates, **_: post_bulk_edit_calls.append(updates),
+    ).bind(request=req('post', _all_pks_='1', **{'bulk/b': 'changed', '-bulk/submit': ''}))
+    t.render_to_response()
+
+    assert [(x.a, x.b) for x in TFoo.objects.all()] == [(i, 'changed') for i in range(5)]
+    assert post_bulk_edit_calls == [dict(b='changed')]
+
+    TBaz.objects.create()
+    t = Table(
+        auto__model=TBaz,
+        columns__foo__bulk__include=True,
+        bulk_batch_size=1,
+    ).bind(request=req('post', _all_pks_='1', **{'bulk/foo': [foos[0].pk, foos[1].pk], '-bulk/submit': ''}))
+    t.render_to_response()
+    assert [list(x.foo.all()) for x in TBaz.objects.all()] == [foos[:2], foos[:2]]
+    assert list(baz.foo.all()) == foos[:2]
 
 
 @pytest.mark.django_db
@@ -996,6 +1078,75 @@ def test_bulk_delete_all_uses_original_rows():
     assert list(TFoo.objects.all().order_by('a').values_list('a', flat=True)) == [2]
 
 
+@pytest.mark.django_db
+def test_bulk_delete_confirmation_is_paginated():
+    for i in range(5):
+        TFoo.objects.create(a=i, b='a')
+    table = Table(
+        auto__model=TFoo,
+        page_size=2,
+        bulk__actions__delete__include=True,
+    )
+
+    with collect_queries() as queries:
+        content = table.bind(request=req('post', _all_pks_='1', **{'-delete': ''})).render_to_response().content
+    soup = BeautifulSoup(content, 'html.parser')
+    assert soup.select('h1')[0].text == 'Are you sure you want to delete these 5 items?'
+    assert len(soup.select('tbody tr')) == 2
+    assert 'Showing the first 2 of 5 items.' in soup.text
+    assert len([x for x in queries if 'COUNT' in x]) == 1
+
+    # A selection is shown in full
+    content = table.bind(request=req('post', pk_1='', pk_2='', pk_3='', **{'-delete': ''})).render_to_response().content
+    soup = BeautifulSoup(content, 'html.parser')
+    assert soup.select('h1')[0].text == 'Are you sure you want to delete these 3 items?'
+    assert len(soup.select('tbody tr')) == 3
+
+
+@pytest.mark.django_db
+def test_bulk_delete_with_bulk_batch_size():
+    foos = [TFoo.objects.create(a=i, b='a') for i in range(5)]
+    TBar.objects.create(foo=foos[0], c=True)
+    progress = []
+
+    t = Table(
+        auto__model=TFoo,
+        bulk_batch_size=2,
+        bulk__actions__delete__include=True,
+        on_bulk_delete_progress=lambda deleted_count, total_count, **_: progress.append((deleted_count, total_count)),
+    ).bind(request=req('post', _all_pks_='1', confirmed='confirmed', **{'-delete': ''}))
+    with collect_queries() as queries:
+        response = t.render_to_response()
+
+    assert response.status_code == 302
+    assert progress == [(2, 5), (4, 5), (5, 5)]
+    assert TFoo.objects.count() == 0
+    assert TBar.objects.count() == 0
+    assert not [x for x in queries if 'COUNT' in x]
+
+
+@pytest.mark.django_db
+def test_bulk_delete_with_bulk_batch_size_uses_default_manager(monkeypatch):
+    class SoftDeleteQuerySet(QuerySet):
+        def delete(self):
+            return self.update(b='deleted')
+
+    manager = SoftDeleteQuerySet.as_manager()
+    manager.model = TFoo
+    monkeypatch.setattr(TFoo._meta, 'default_manager', manager)
+
+    for i in range(3):
+        TFoo.objects.create(a=i, b='a')
+
+    Table(
+        auto__model=TFoo,
+        bulk_batch_size=2,
+        bulk__actions__delete__include=True,
+    ).bind(request=req('post', _all_pks_='1', confirmed='confirmed', **{'-delete': ''})).render_to_response()
+
+    assert [x.b for x in TFoo.objects.all()] == ['deleted'] * 3
+
+
 @pytest.mark.django_db
 def test_bulk_include_false():
 
@@ -2055,6 +2206,11 @@ def test_ordering():
     t = t.bind(request=req('get', order='b'))
     assert list(t.sorted_rows.query.order_by) == ['b']
 
+    # descending ordering flips each sort key
+    t = Table(auto__model=TFoo, columns__a__sort_key=['a', '-b'])
+    t = t.bind(request=req('get', order='-a'))
+    assert list(t.sorted_rows.query.order_by) == ['-a', 'b']
+
 
 @pytest.mark.django_db
 def test_many_to_many():
@@ -2583,6 +2739,432 @@ def test_paginator_clamping():
     assert t.bind(request=req('get', page='11')).paginator.page == 10
 
 
+@pytest.mark.django_db
+def test_only_needed_fields():
+    foo = TFoo.objects.create(a=1, b='foo')
+    TBar.objects.create(foo=foo, c=True)
+
+    # One query for the count and one for the rows, with the foreign key from select_related
+    with collect_queries() as queries:
+        t = Table(auto__model=TBar, columns__c__include=False, only_needed_fields=True).bind(request=req('get'))
+        assert 'Foo(1, foo)' in t.__html__()
+    assert len(queries) == 2
+    assert t.sorted_and_filtered_rows.query.deferred_loading == (frozenset({'id', 'foo'}), False)
+
+    # Not a model field, so we don't know what to fetch
+    t = Table(
+        auto__model=TFoo,
+        columns__x=Column(attr='__str__'),
+        only_needed_fields=True,
+    ).bind(request=req('get'))
+    assert t.sorted_and_filtered_rows.query.deferred_loading == (frozenset(), True)
+
+    # Don't touch querysets that already have deferred fields
+    t = Table(auto__model=TFoo, rows=TFoo.objects.defer('b'), only_needed_fields=True).bind(request=req('get'))
+    assert t.sorted_and_filtered_rows.query.deferred_loading == (frozenset({'b'}), True)
+
+
+def test_needed_fields():
+    assert needed_fields(TBar, ['foo__a', 'c', 'pk']) == {'id', 'foo', 'c'}
+    assert needed_fields(TBar, ['foo_id']) == {'id', 'foo'}
+    assert needed_fields(TFoo, ['tbar']) == {'id'}
+    assert needed_fields(TFoo, ['does_not_exist']) is None
+
+
+def test_infer_related_lookups():
+    assert infer_related_lookups(TBar, 'c') == (None, None)
+    assert infer_related_lookups(TBar, 'foo') == ('foo', None)
+    assert infer_related_lookups(TBar, 'foo__b') == ('foo', None)
+    assert infer_related_lookups(TBar, 'foo_id') == (None, None)
+    assert infer_related_lookups(TBar, 'foo__tbaz_set') == ('foo', 'foo__tbaz_set')
+    assert infer_related_lookups(TBaz, 'foo__a') == (None, 'foo')
+    assert infer_related_lookups(TFoo, 'tbar_set__c') == (None, 'tbar_set')
+    assert infer_related_lookups(TFoo, 'tbar__c') == (None, None)
+    assert infer_related_lookups(TFoo, 'does_not_exist') == (None, None)
+
+
+@pytest.mark.django_db
+def test_related_lookups_are_inferred_from_attr():
+    for i in range(3):
+        TBar.objects.create(foo=TFoo.objects.create(a=i, b='foo'), c=True)
+
+    with collect_queries() as queries:
+        t = Table(
+            auto__model=TBar,
+            columns__foo_b=Column(attr='foo__b'),
+            columns__foo__include=False,
+        ).bind(request=req('get'))
+        t.__html__()
+    # One query for the count and one for the rows
+    assert len(queries) == 2
+    assert 'JOIN' in queries[1]
+
+
+@pytest.mark.django_db
+def test_related_lookups_inference_can_be_turned_off():
+    for i in range(3):
+        TBar.objects.create(foo=TFoo.objects.create(a=i, b='foo'), c=True)
+
+    with collect_queries() as queries:
+        t = Table(
+            auto__model=TBar,
+            columns__foo_b=Column(attr='foo__b'),
+            columns__foo__include=False,
+            infer_related_lookups=False,
+        ).bind(request=req('get'))
+        t.__html__()
+    # One query for the count, one for the rows and one per row for `foo`
+    assert len(queries) == 5
+    assert 'JOIN' not in queries[1]
+
+
+@pytest.mark.django_db
+def test_repeated_queries_warning(settings):
+    settings.DEBUG = True
+    for i in range(3):
+        TBar.objects.create(foo=TFoo.objects.create(a=i, b='foo'), c=True)
+
+    t = Table(
+        auto__model=TBar,
+        columns__foo__include=False,
+        columns__a=Column(cell__value=lambda row, **_: TFoo.objects.get(pk=row.foo_id).a),
+    ).bind(request=req('get'))
+
+    with pytest.warns(RepeatedQueriesWarning) as record:
+        t.__html__()
+    assert len(record) == 1
+    assert str(record[0].message).startswith('Rendering 3 rows of <iommi.table.Table')
+    assert 'ran the same query 3 times' in str(record[0].message)
+
+    reported = []
+    t = Table(
+        auto__model=TBar,
+        columns__a=Column(attr='foo__a'),
+        on_repeated_queries=lambda **kwargs: reported.append(kwargs),  # pragma: no cover
+    ).bind(request=req('get'))
+    t.__html__()
+    assert reported == []
+
+
+def test_attr_getter():
+    row = Struct(a=Struct(b=Struct(c=3)), n=None, d={'x': 1})
+    assert attr_getter('a__b__c')(row) == 3
+    assert attr_getter('n')(row) is None
+    assert attr_getter('n__foo')(row) is None
+    assert attr_getter(None)(row) is None
+    assert attr_getter('')(row) is row
+
+    with pytest.raises(AttributeError) as e:
+        attr_getter('a__missing')(row)
+    assert str(e.value) == getattr_path_error(row, 'a__missing')
+
+    with pytest.raises(AttributeError) as e:
+        attr_getter('missing')(row)
+    assert str(e.value) == getattr_path_error(row, 'missing')
+
+
+def getattr_path_error(row, path):
+    try:
+        getattr_path(row, path)
+    except AttributeError as e:
+        return str(e)
+
+
+def test_cell_value_from_attr_getter():
+    t = Table(
+        columns__a=Column(attr='x__y'),
+        columns__b=Column(cell__value=lambda row, **_: row.x.y * 2),
+        rows=[Struct(x=Struct(y=1)), Struct(x=None)],
+    ).bind(request=req('get'))
+    # noinspection PyProtectedMember
+    plan = t._row_render_plan
+    assert plan.cell_render_plan(t.columns.a).value_getter is not None
+    assert plan.cell_render_plan(t.columns.b).value_getter is None
+
+    cells = list(t.cells_for_rows())
+    assert cells[0]['a'].value == 1
+    assert cells[0]['b'].value == 2
+    assert cells[1]['a'].value is None
+
+
+@pytest.mark.django_db
+def test_paginator_capped_count():
+    for x in range(5):
+        TFoo.objects.create(a=x, b="foo")
+
+    def bind(limit, **params):
+        return Table(
+            auto__model=TFoo,
+            page_size=2,
+            parts__page__count=capped_count(limit=limit),
+        ).bind(request=req('get', **params))
+
+    t = bind(limit=10)
+    assert t.paginator.count == 5
+    assert t.paginator.number_of_pages == 3
+
+    t = bind(limit=3, page=3)
+    assert isinstance(t.paginator.count, CappedCount)
+    assert str(t.paginator.count) == '3+'
+    assert t.paginator.number_of_pages == 2
+    assert t.paginator.page == 2
+    assert t.paginator.context['hits'] == 3
+
+    assert capped_count(limit=1)(rows=[1, 2, 3]) == 3
+
+
+@pytest.mark.django_db
+def test_paginator_estimated_count():
+    for x in range(3):
+        TFoo.objects.create(a=x, b="foo")
+
+    # Not on PostgreSQL, and filtered querysets, fall back to exact counts
+    assert estimated_count(threshold=0)(rows=TFoo.objects.all()) == 3
+    assert estimated_count(threshold=0)(rows=TFoo.objects.filter(a__gt=0)) == 2
+    assert estimated_count()(rows=[1, 2]) == 2
+
+
+@pytest.mark.django_db
+def test_paginator_cached_count():
+    from django.core.cache import cache
+
+    cache.clear()
+    for x in range(3):
+        TFoo.objects.create(a=x, b="foo")
+
+    count = cached_count(timeout=60)
+    assert count(rows=TFoo.objects.all()) == 3
+    assert count(rows=TFoo.objects.filter(a__gt=0)) == 2
+
+    with collect_queries() as queries:
+        assert count(rows=TFoo.objects.all()) == 3
+        assert count(rows=TFoo.objects.none()) == 0
+    assert queries == []
+
+    capped = cached_count(count=capped_count(limit=2))
+    assert str(capped(rows=TFoo.objects.all())) == '2+'
+    with collect_queries() as queries:
+        assert str(capped(rows=TFoo.objects.all())) == '2+'
+    assert queries == []
+
+    # Saving an instance invalidates the cached counts, but bulk operations don't
+    TFoo.objects.create(a=4, b="foo")
+    assert count(rows=TFoo.objects.all()) == 4
+    TFoo.objects.all().delete()
+    assert count(rows=TFoo.objects.all()) == 0
+    TFoo.objects.bulk_create([TFoo(a=5, b="foo")])
+    assert count(rows=TFoo.objects.all()) == 0
+    invalidate_table_cache(TFoo)
+    assert count(rows=TFoo.objects.all()) == 1
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_paginator_cached_count_m2m_changed():
+    from django.core.cache import cache
+
+    cache.clear()
+    foo = TFoo.objects.create(a=1, b='foo')
+    baz = TBaz.objects.create()
+
+    count = cached_count(timeout=60)
+    assert count(rows=TBaz.objects.filter(foo=foo)) == 0
+
+    baz.foo.add(foo)
+    assert count(rows=TBaz.objects.filter(foo=foo)) == 1
+    foo.tbaz_set.remove(baz)
+    assert count(rows=TBaz.objects.filter(foo=foo)) == 0
+    cache.clear()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('bulk_batch_size', [None, 2])
+def test_bulk_edit_invalidates_cached_count(bulk_batch_size):
+    from django.core.cache import cache
+
+    cache.clear()
+    for x in range(3):
+        TFoo.objects.create(a=x, b='foo')
+
+    count = cached_count(timeout=60)
+    assert count(rows=TFoo.objects.filter(b='foo')) == 3
+
+    Table(
+        auto__model=TFoo,
+        columns__b__bulk__include=True,
+        bulk_batch_size=bulk_batch_size,
+    ).bind(request=req('post', _all_pks_='1', **{'bulk/b': 'bar', '-bulk/submit': ''})).render_to_response()
+
+    assert count(rows=TFoo.objects.filter(b='foo')) == 0
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_paginator_cached_page():
+    from django.core.cache import cache
+
+    cache.clear()
+    foos = [TFoo.objects.create(a=x, b="foo") for x in range(5)]
+
+    def bind(**params):
+        return Table(
+            auto__model=TFoo,
+            page_size=2,
+            parts__page__slice=cached_page(timeout=60),
+        ).bind(request=req('get', **params))
+
+    assert [x.a for x in bind(page=2).visible_rows] == [2, 3]
+    with collect_queries() as queries:
+        assert [x.a for x in bind(page=2).visible_rows] == [2, 3]
+    # count and rows by pk, no OFFSET
+    assert len(queries) == 2
+    assert 'OFFSET' not in queries[1] and 'IN' in queries[1]
+
+    assert [x.a for x in bind(page=2, order='-a').visible_rows] == [2, 1]
+    assert [x.a for x in bind(page=2, page_size=3).visible_rows] == [3, 4]
+
+    # Only the pks are cached, so the rows are fresh. Deleting a row invalidates the cached pages.
+    TFoo.objects.filter(pk=foos[2].pk).update(b='bar')
+    assert [x.b for x in bind(page=2).visible_rows] == ['bar', 'foo']
+    foos[3].delete()
+    assert [x.a for x in bind(page=2).visible_rows] == [2, 4]
+
+    assert cached_page()(rows=[1, 2, 3], bottom=1, top=2) == [2]
+    assert cached_page()(rows=TFoo.objects.none(), bottom=1, top=2) == []
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_paginator_keyset():
+    for x in range(5):
+        TFoo.objects.create(a=x % 2, b=str(x))
+
+    def bind(**params):
+        return Table(
+            auto__model=TFoo,
+            rows=TFoo.objects.all().order_by('-a'),
+            page_size=2,
+            parts__page__keyset=True,
+        ).bind(request=req('get', **params))
+
+    t = bind()
+    assert [x.b for x in t.visible_rows] == ['1', '3']
+    assert t.paginator.count is None
+    assert t.paginator.is_paginated() is True
+    assert t.paginator.context['has_previous'] is False
+    next_cursor = t.paginator.context['next']
+    assert next_cursor.startswith('n.')
+    assert f'?page={next_cursor}' in t.__html__()
+
+    t = bind(page=next_cursor)
+    assert [x.b for x in t.visible_rows] == ['0', '2']
+    assert t.paginator.context['has_previous'] is True
+    previous_cursor = t.paginator.context['previous']
+
+    t = bind(page=t.paginator.context['next'])
+    assert [x.b for x in t.visible_rows] == ['4']
+    assert t.paginator.context['has_next'] is False
+    assert t.paginator.context['next'] is None
+
+    t = bind(page=previous_cursor)
+    assert [x.b for x in t.visible_rows] == ['1', '3']
+    assert t.paginator.context['has_previous'] is False
+    assert t.paginator.context['has_next'] is True
+
+    # Garbage cursors start from the beginning
+    assert [x.b for x in bind(page='n.garbage').visible_rows] == ['1', '3']
+    assert [x.b for x in bind(page='1').visible_rows] == ['1', '3']
+
+
+@pytest.mark.django_db
+def test_paginator_keyset_foreign_key_ordering():
+    foos = [TFoo.objects.create(a=x, b=str(x)) for x in range(3)]
+    for foo in reversed(foos):
+        TBar.objects.create(foo=foo, c=True)
+
+    def bind(**params):
+        return Table(
+            auto__model=TBar,
+            rows=TBar.objects.all().order_by('-foo'),
+            page_size=2,
+            parts__page__keyset=True,
+        ).bind(request=req('get', **params))
+
+    t = bind()
+    assert [x.foo.b for x in t.visible_rows] == ['2', '1']
+    t = bind(page=t.paginator.context['next'])
+    assert [x.foo.b for x in t.visible_rows] == ['0']
+
+    assert keyset_ordering(TBar.objects.order_by('foo__b', 'foo')) == [
+        ('foo__b', False, False),
+        ('foo_id', False, False),
+        ('pk', False, False),
+    ]
+
+
+@pytest.mark.django_db
+def test_paginator_keyset_null_on_page_boundary():
+    for i, d in enumerate([1, None, 0, None, 2]):
+        CSVExportTestModel.objects.create(a=i, b='x', c=0, d=d)
+
+    assert keyset_ordering(CSVExportTestModel.objects.order_by('d')) == [('d', False, True), ('pk', False, False)]
+
+    def bind(order, **params):
+        return Table(
+            auto__model=CSVExportTestModel,
+            rows=CSVExportTestModel.objects.order_by(order),
+            page_size=2,
+            parts__page__keyset=True,
+        ).bind(request=req('get', **params))
+
+    for order, expected_pages in [
+        ('d', [[2, 0], [4, 1], [3]]),
+        ('-d', [[1, 3], [4, 0], [2]]),
+    ]:
+        pages = []
+        t = bind(order)
+        while True:
+            pages.append([x.a for x in t.visible_rows])
+            if not t.paginator.context['has_next']:
+                break
+            t = bind(order, page=t.paginator.context['next'])
+        assert pages == expected_pages
+
+        # And back again
+        while t.paginator.context['has_previous']:
+            t = bind(order, page=t.paginator.context['previous'])
+            assert [x.a for x in t.visible_rows] == pages[-2]
+            pages.pop()
+
+
+def test_keyset_ordering_errors():
+    with pytest.raises(KeysetPaginationException) as e:
+        keyset_ordering(TFoo.objects.order_by(F('a').asc(nulls_last=True)))
+    assert str(e.value).startswith('Keyset pagination only supports ordering on fields, got OrderBy(')
+
+    with pytest.raises(KeysetPaginationException) as e:
+        keyset_ordering(TFoo.objects.order_by('tbar'))
+    assert str(e.value) == 'Keyset pagination can not order on tbar, since it can have many rows'
+
+
+def test_keyset_q():
+    assert repr(keyset_q([('a', False, False), ('pk', False, False)], [1, 2], forward=True)) == repr(
+        Q(pk__in=[]) | Q(a__gt=1) | Q(a=1, pk__gt=2)
+    )
+    assert repr(keyset_q([('a', True, False), ('pk', False, False)], [1, 2], forward=False)) == repr(
+        Q(pk__in=[]) | Q(a__gt=1) | Q(a=1, pk__lt=2)
+    )
+    assert repr(keyset_q([('a', False, True), ('pk', False, False)], [1, 2], forward=True)) == repr(
+        Q(pk__in=[]) | (Q(a__gt=1) | Q(a__isnull=True)) | Q(a=1, pk__gt=2)
+    )
+    assert repr(keyset_q([('a', False, True), ('pk', False, False)], [None, 2], forward=True)) == repr(
+        Q(pk__in=[]) | Q(a__isnull=True, pk__gt=2)
+    )
+    assert repr(keyset_q([('a', False, True), ('pk', False, False)], [None, 2], forward=False)) == repr(
+        Q(pk__in=[]) | Q(a__isnull=False) | Q(a__isnull=True, pk__lt=2)
+    )
+
+
 @pytest.mark.django_db
 def test_reinvoke():
     class MyTable(Table):
@@ -2647,6 +3229,45 @@ class MyTable(Table):
     assert repr(t.header_levels[0][0]) == '<Header: foo>'
 
 
+def test_row_render_plan_evaluates_static_parts_once():
+    class MyTable(Table):
+        foo = Column(cell__attrs__class__static=True)
+        bar = Column(cell__attrs__title=lambda row, **_: f'title {row.bar}')
+
+    rows = [Struct(foo=1, bar=2), Struct(foo=3, bar=4)]
+    t = MyTable(rows=rows).bind(request=req('get'))
+    first, second = list(t.cells_for_rows())
+
+    assert first['foo'].attrs is second['foo'].attrs
+    assert str(first['foo'].attrs) == ' class="static"'
+    assert first['bar'].attrs is not second['bar'].attrs
+    assert str(first['bar'].attrs) == ' title="title 2"'
+    assert str(second['bar'].attrs) == ' title="title 4"'
+
+    # row__attrs has a callable for data-pk by default
+    assert first.attrs is not second.attrs
+    assert first.row == rows[0]
+    assert second.row_index == 1
+
+
+def test_row_render_plan_static_row_attrs():
+    t = Table(
+        columns__foo=Column(),
+        row__attrs={'data-pk': None, 'class': {'static_row': True}},
+        rows=[Struct(foo=1), Struct(foo=2)],
+    ).bind(request=req('get'))
+    first, second = list(t.cells_for_rows())
+    assert first.attrs is second.attrs
+    assert first.__html__() == '<tr class="static_row"><td>1</td></tr>'
+    assert second.__html__() == '<tr class="static_row"><td>2</td></tr>'
+
+
+def test_render_leaves_no_render_cache_on_tbody():
+    t = Table(columns__foo=Column(), rows=[Struct(foo=1)]).bind(request=req('get'))
+    assert '<td>1</td>' in t.__html__()
+    assert getattr(t.tbody._declared, '_iommi_render_cache', None) is None
+
+
 @pytest.mark.django_db
 def test_automatic_url():
     foo = AutomaticUrl.objects.create(a=7)
@@ -3128,6 +3749,97 @@ def test_order_by_on_list_nested():
     assert sorted_rows == list(reversed(rows))
 
 
+def test_query_on_list():
+    rows = [Struct(a=x, b='even' if x % 2 == 0 else 'odd') for x in range(6)]
+    t = Table(
+        rows=rows,
+        columns__a=Column.integer(filter__include=True),
+        columns__b=Column(filter__include=True, filter__field__include=True),
+        page_size=2,
+    )
+
+    assert Table(rows=rows, columns__a=Column()).bind(request=req('get')).query is None
+
+    bound = t.bind(request=req('get', b='Odd', order='-a'))
+    assert bound.query is not None
+    assert [x.a for x in bound.visible_rows] == [5, 3]
+    assert len(bound.sorted_and_filtered_rows) == 3
+
+    bound = t.bind(request=req('get', **{'-query/query': 'a>1 and b=even'}))
+    assert [x.a for x in bound.visible_rows] == [2, 4]
+
+
+def test_lazily_sorted_list():
+    rows = [Struct(a=x % 4, b=x) for x in range(10)]
+    expected = sorted(rows, key=lambda x: x.a)
+
+    s = LazilySortedList(rows, order_fields=['a'])
+    assert len(s) == 10
+    assert s._keys_by_field is None
+    assert s[0:3] == expected[0:3]
+    assert s[3:6] == expected[3:6]
+    assert s._sorted is None
+    assert s[8:20] == expected[8:]
+    assert s[-1] == expected[-1]
+    assert list(s) == expected
+    assert s._sorted == expected
+
+    s = LazilySortedList(rows, order_fields=['a'], is_desc=True)
+    assert s[2:5] == sorted(rows, key=lambda x: x.a, reverse=True)[2:5]
+    assert s == sorted(rows, key=lambda x: x.a, reverse=True)
+
+    expected = sorted(rows, key=lambda x: (x.a, -x.b))
+    s = LazilySortedList(rows, order_fields=['a', '-b'])
+    assert s[0:4] == expected[0:4]
+    assert s == expected
+
+
+def test_ordered_by_on_list_multiple_keys():
+    rows = [
+        Struct(a=2, b='x', c=Struct(d=1)),
+        Struct(a=None, b='y', c=Struct(d=2)),
+        Struct(a=1, b='x', c=None),
+        Struct(a=1, b=None, c=Struct(d=3)),
+    ]
+
+    assert ordered_by_on_list(rows, 'a') == [rows[1], rows[2], rows[3], rows[0]]
+    assert ordered_by_on_list(rows, 'a', is_desc=True) == [rows[0], rows[2], rows[3], rows[1]]
+    assert ordered_by_on_list(rows, ['b', 'a']) == [rows[3], rows[2], rows[0], rows[1]]
+    assert ordered_by_on_list(rows, ['b', '-a']) == [rows[3], rows[0], rows[2], rows[1]]
+    assert ordered_by_on_list(rows, ['b', '-a'], is_desc=True) == [rows[1], rows[2], rows[0], rows[3]]
+    assert ordered_by_on_list(rows, 'c__d') == [rows[2], rows[0], rows[1], rows[3]]
+    assert ordered_by_on_list(rows, [lambda x: x.b, 'c__d']) == [rows[3], rows[2], rows[0], rows[1]]
+
+
+def test_sort_on_list_with_multiple_sort_keys():
+    rows = [Struct(a=1, b=1), Struct(a=0, b=2), Struct(a=1, b=2), Struct(a=0, b=1)]
+    t = Table(
+        rows=rows,
+        columns__a=Column(sort_key=['a', '-b']),
+        columns__b=Column(),
+    )
+    assert list(t.bind(request=req('get', order='a')).visible_rows) == [rows[1], rows[3], rows[2], rows[0]]
+    assert list(t.bind(request=req('get', order='-a')).visible_rows) == [rows[0], rows[2], rows[3], rows[1]]
+
+
+def test_sort_after_filter_on_list():
+    rows = [TFoo(pk=x, a=x, b='even' if x % 2 == 0 else 'odd') for x in range(10)]
+
+    t = Table(
+        auto__model=TFoo,
+        rows=rows,
+        columns__b__filter__include=True,
+        query__postprocess=lambda rows, **_: [x for x in rows if x.b == 'odd'],
+        page_size=2,
+    ).bind(request=req('get', order='-a'))
+
+    # Only the filtered rows are sorted
+    assert isinstance(t.sorted_and_filtered_rows, LazilySortedList)
+    assert t.sorted_and_filtered_rows.objects == [x for x in rows if x.b == 'odd']
+    assert [x.a for x in t.visible_rows] == [9, 7]
+    assert t.sorted_and_filtered_rows._sorted is None
+
+
 def test_sort_default_desc_no_sort():
     class TestTable(Table):
         foo = Column()
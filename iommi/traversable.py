@@ -2,7 +2,6 @@
 from typing import (
     Any,
     Dict,
-    List,
     Union,
 )
 
@@ -18,15 +17,18 @@
 from iommi.base import (
     items,
     NOT_BOUND_MESSAGE,
+    values,
 )
 from iommi.evaluate import (
     evaluate_members,
     evaluate_strict,
     evaluate_strict_container,
+    signature_from_kwargs,
 )
 from iommi.style import (
     apply_style,
     get_iommi_style_name,
+    get_style,
 )
 
 
@@ -53,6 +55,11 @@ class Traversable(RefinableObject):
     _parent = None
     _is_bound = False
     _request = None
+    _iommi_frozen = False
+    _iommi_path_cache = None
+    _iommi_long_path = None
+    _iommi_path_maps = None
+    _iommi_shared_path_maps = None
     context = None
 
     iommi_style: str = Refinable()
@@ -65,6 +72,7 @@ def __init__(self, _name=None, **kwargs):
         self._declared_members = Struct()
         self._bound_members = None
         self._evaluate_parameters = None
+        self._evaluate_parameters_signature = None
         self._name = _name
 
         super(Traversable, self).__init__(**kwargs)
@@ -101,14 +109,25 @@ def iommi_bound_members(self) -> Dict[str, 'Traversable']:
 
     @property
     def iommi_path(self) -> str:
-        long_path = build_long_path(self)
         path_by_long_path = get_path_by_long_path(self)
+        # The path is stored together with the map it was resolved in, so it is recalculated if the map changes
+        cached = self._iommi_path_cache
+        if cached is not None and cached[0] is path_by_long_path:
+            return cached[1]
+
+        long_path = build_long_path(self)
         path = path_by_long_path.get(long_path)
+        if path is None:
+            # The tree differs from the one the shared maps were built from
+            path_by_long_path = get_path_maps(self, rebuild=True)[1]
+            path = path_by_long_path.get(long_path)
         if path is None:
             candidates = '\n'.join(path_by_long_path.keys())
             raise PathNotFoundException(
                 f"Path not found(!) (Searched for {long_path} among the following:\n{candidates}"
             )
+        if self._is_bound:
+            self._iommi_path_cache = (path_by_long_path, path)
         return path
 
     @property
@@ -120,8 +139,6 @@ def bind(self, *, parent=None, request=None):
         assert parent is None or parent._is_bound
         assert not self._is_bound
 
-        result = copy.copy(self)
-
         if parent:
             is_root = False
             iommi_style = get_iommi_style_name(parent)
@@ -129,7 +146,10 @@ def bind(self, *, parent=None, request=None):
             is_root = True
             iommi_style = get_iommi_style_name(self)
 
-        result = apply_style(iommi_style, result, is_root)
+        if self._iommi_frozen:
+            result = copy.copy(self._iommi_frozen_prototype(iommi_style, is_root))
+        else:
+            result = apply_style(iommi_style, copy.copy(self), is_root)
         result._declared = self
 
         del self  # to prevent mistakes when changing the code below
@@ -143,6 +163,10 @@ def bind(self, *, parent=None, request=None):
         result._parent = parent
         result._bound_members = Struct()
         result._is_bound = True
+        result._iommi_path_cache = None
+        result._iommi_long_path = None
+        result._iommi_path_maps = None
+        result._iommi_shared_path_maps = None
 
         evaluate_parameters = {
             **(parent.iommi_evaluate_parameters() if parent is not None else {}),
@@ -152,9 +176,12 @@ def bind(self, *, parent=None, request=None):
         if parent is None:
             evaluate_parameters['request'] = request
         result._evaluate_parameters = evaluate_parameters
+        # The names of the evaluate parameters are fixed from here on, so we only need to compute the signature once
+        signature = signature_from_kwargs(evaluate_parameters)
+        result._evaluate_parameters_signature = signature
 
         if hasattr(result, 'include'):
-            include = evaluate_strict(result.include, **evaluate_parameters)
+            include = evaluate_strict(result.include, __signature=signature, **evaluate_parameters)
             if not bool(include):
                 return None
 
@@ -167,18 +194,44 @@ def bind(self, *, parent=None, request=None):
             return None
 
         if hasattr(result, 'attrs'):
-            result.attrs = evaluate_attrs(result, **result.iommi_evaluate_parameters())
+            result.attrs = evaluate_attrs(result, __signature=signature, **evaluate_parameters)
 
         evaluated_attributes = [
             k for k, v in items(result.get_declared('refinable_members')) if is_evaluated_refinable(v)
         ]
-        evaluate_members(result, evaluated_attributes, **evaluate_parameters)
+        evaluate_members(result, evaluated_attributes, __signature=signature, **evaluate_parameters)
 
         if hasattr(result, 'extra_evaluated'):
-            result.extra_evaluated = evaluate_strict_container(result.extra_evaluated or {}, **evaluate_parameters)
+            result.extra_evaluated = evaluate_strict_container(
+                result.extra_evaluated or {}, __signature=signature, **evaluate_parameters
+            )
 
         return result
 
+    def iommi_freeze(self):
+        """
+        Mark this object as a prototype that is bound many times, typically
+        because it's created once at module level. The style is then applied
+        once (per style) instead of on every bind, and the result is reused.
+        This also goes for the declared members, recursively.
+
+        A frozen object must not be changed after the first bind, except via
+        `set_and_remember_for_reinvoke`.
+        """
+        assert not self._is_bound
+        self._iommi_frozen = True
+        self._iommi_frozen_prototypes = {}
+        return self
+
+    def _iommi_frozen_prototype(self, iommi_style, is_root):
+        key = (get_style(iommi_style), is_root)
+        prototype = self._iommi_frozen_prototypes.get(key)
+        if prototype is None:
+            prototype = apply_style(iommi_style, copy.copy(self), is_root)
+            freeze_declared_members(prototype)
+            self._iommi_frozen_prototypes[key] = prototype
+        return prototype
+
     def on_bind(self) -> None:
         pass
 
@@ -188,6 +241,9 @@ def own_evaluate_parameters(self):
     def iommi_evaluate_parameters(self):
         return self._evaluate_parameters
 
+    def iommi_evaluate_parameters_signature(self):
+        return self._evaluate_parameters_signature
+
     def get_request(self):
         if self._parent is None:
             return self._request
@@ -206,42 +262,77 @@ def declared_members(node: Traversable) -> Any:
     return node._declared_members
 
 
+def freeze_declared_members(node: Traversable):
+    for member in values(declared_members(node)):
+        members = values(member) if isinstance(member, dict) else [member]
+        for x in members:
+            if isinstance(x, Traversable) and not x._iommi_frozen:
+                x.iommi_freeze()
+
+
 def set_declared_member(node: Traversable, name: str, value: Union[Any, Dict[str, Traversable]]):
     root = node.iommi_root()
-    if hasattr(root, '_long_path_by_path') or hasattr(root, '_path_by_long_path'):
-        print("### A disturbance in the force... The namespace has been recalculated!")
-        root._long_path_by_path = root._path_by_long_path = None
+    if root._iommi_path_maps is not None:
+        # The paths have been used already, so they are looked up again. The maps that a bound root shares with the
+        # other binds of its declared object are kept, and rebuilt only if a path turns out to be missing from them.
+        root._iommi_path_maps = None
+        if _path_maps_owner(root) is root:
+            root._iommi_shared_path_maps = None
     # noinspection PyProtectedMember
     node._declared_members[name] = value
 
 
-def get_long_path_by_path(node):
+def _path_maps_owner(root):
+    # Bound roots share their path maps with every other bind of the same declared object, so the maps are built
+    # once and not on every request
+    return getattr(root, '_declared', None) or root
+
+
+def get_path_maps(node, rebuild=False):
+    """
+    Returns the path maps of the tree of `node`, as a tuple of `long_path_by_path` and `path_by_long_path`. They
+    are shared between requests and must not be modified. If the tree differs from the one the maps were built
+    from, pass `rebuild=True` to build them from the current tree.
+    """
     root = node.iommi_root()
-    long_path_by_path = getattr(root, '_long_path_by_path', None)
-    if long_path_by_path is None:
-        long_path_by_path = build_long_path_by_path(root)
-        root._long_path_by_path = long_path_by_path
-    return long_path_by_path
+    maps = None if rebuild else root._iommi_path_maps
+    if maps is None:
+        owner = _path_maps_owner(root)
+        maps = None if rebuild else owner._iommi_shared_path_maps
+        if maps is None:
+            long_path_by_path = build_long_path_by_path(root)
+            maps = long_path_by_path, {v: k for k, v in items(long_path_by_path)}
+            owner._iommi_shared_path_maps = maps
+        root._iommi_path_maps = maps
+    return maps
+
+
+def get_long_path_by_path(node):
+    return get_path_maps(node)[0]
 
 
 def get_path_by_long_path(node):
-    root = node.iommi_root()
-    path_by_long_path = getattr(root, '_path_by_long_path', None)
-    if path_by_long_path is None:
-        long_path_by_path = get_long_path_by_path(root)
-        path_by_long_path = {v: k for k, v in items(long_path_by_path)}
-        root._path_by_long_path = path_by_long_path
-    return path_by_long_path
+    return get_path_maps(node)[1]
 
 
 def build_long_path(node: Traversable) -> str:
-    def _traverse(t: Traversable) -> List[str]:
-        assert t.iommi_name() is not None
-        if t.iommi_parent() is None:
-            return []
-        return _traverse(t.iommi_parent()) + [t.iommi_name()]
-
-    return '/'.join(_traverse(node))
+    # Bound nodes can't move in the tree, so they remember their long path. This makes it cheap to build from the
+    # (remembered) long path of the parent.
+    long_path = getattr(node, '_iommi_long_path', None)
+    if long_path is not None:
+        return long_path
+
+    assert node.iommi_name() is not None
+    parent = node.iommi_parent()
+    if parent is None:
+        long_path = ''
+    else:
+        parent_long_path = build_long_path(parent)
+        long_path = f'{parent_long_path}/{node.iommi_name()}' if parent_long_path else node.iommi_name()
+
+    if node._is_bound:
+        node._iommi_long_path = long_path
+    return long_path
 
 
 def include_in_short_path(node):
@@ -32,9 +32,14 @@
 from iommi.page import (
     Page,
 )
-from iommi.reinvokable import reinvokable
+from iommi.reinvokable import (
+    reinvokable,
+    set_and_remember_for_reinvoke,
+)
+from iommi import traversable
 from iommi.style import unregister_style
 from iommi.traversable import (
+    build_long_path,
     build_long_path_by_path,
     evaluated_refinable,
     EvaluatedRefinable,
@@ -120,6 +125,52 @@ class MyPage(Page):
     assert set(keys(page.iommi_evaluate_parameters())) == {'traversable', 'page', 'request'}
 
 
+def test_path_maps_are_shared_between_binds_of_the_same_declared_root(monkeypatch):
+    page = Page(parts__foo=Fragment(), parts__bar=Form(fields__baz=Field()))
+    bound_page = page.bind(request=req('get'))
+    assert get_path_by_long_path(bound_page)['parts/bar/fields/baz'] == 'baz'
+
+    # Binding again doesn't walk the tree
+    def fail(root):
+        assert False, 'the path maps should not be rebuilt'
+
+    monkeypatch.setattr(traversable, 'build_long_path_by_path', fail)
+    other_bound_page = page.bind(request=req('get'))
+    assert get_path_by_long_path(bound_page) is get_path_by_long_path(other_bound_page)
+    baz = other_bound_page.parts.bar.fields.baz
+    assert baz.iommi_path == 'baz'
+    assert baz._iommi_path_cache == (get_path_by_long_path(other_bound_page), 'baz')
+    monkeypatch.undo()
+
+    different_page = Page(parts__foo=Fragment()).bind(request=req('get'))
+    assert get_path_by_long_path(bound_page) is not get_path_by_long_path(different_page)
+
+
+def test_path_maps_are_rebuilt_for_a_tree_that_differs():
+    page = Page(parts__foo=Fragment())
+    bound_page = page.bind(request=req('get'))
+    assert 'bar' not in get_path_by_long_path(bound_page)
+
+    other_bound_page = page.bind(request=req('get'))
+    set_declared_member(other_bound_page, 'bar', Fragment(_name='bar').bind(parent=other_bound_page))
+    assert other_bound_page._declared_members.bar.iommi_path == 'bar'
+    assert get_path_by_long_path(other_bound_page)['bar'] == 'bar'
+    assert get_path_by_long_path(other_bound_page)['parts/foo'] == 'foo'
+
+
+def test_long_path_is_remembered_on_bound_nodes():
+    page = Page(parts__foo=Form(fields__bar=Field())).bind(request=req('get'))
+    bar = page.parts.foo.fields.bar
+    assert build_long_path(bar) == 'parts/foo/fields/bar'
+    assert bar._iommi_long_path == 'parts/foo/fields/bar'
+    assert page.parts.foo._iommi_long_path == 'parts/foo'
+    assert page._iommi_long_path == ''
+
+    unbound = Fragment(_name='unbound')
+    assert build_long_path(unbound) == ''
+    assert unbound._iommi_long_path is None
+
+
 def test_evil_names_that_work():
     class EvilPage(Page):
         name = Fragment()
@@ -148,19 +199,15 @@ class ErrorMessages(Page):
     )
 
 
-def test_warning_when_names_are_recalculated(capsys):
+def test_names_are_recalculated():
     page = Page(parts__foo=Fragment(_name='foo'))
     assert get_path_by_long_path(page) == {'parts/foo': ''}
-    out, err = capsys.readouterr()
-    assert out == ''
 
     set_declared_member(page, 'bar', Fragment(_name='bar'))
     assert get_path_by_long_path(page) == {
         'parts/foo': '',
         'bar': 'bar',
     }
-    out, err = capsys.readouterr()
-    assert out == '### A disturbance in the force... The namespace has been recalculated!\n'
 
 
 def test_dunder_path_is_fully_qualified_and_skipping_root():
@@ -229,6 +276,56 @@ class Foo(Traversable):
     assert f.bar == f
 
 
+def test_evaluate_parameters_signature():
+    class Foo(Traversable):
+        bar = EvaluatedRefinable()
+
+        def own_evaluate_parameters(self):
+            return dict(x=3)
+
+    f = Foo(bar=lambda x, traversable, request, **_: x).bind(request=None)
+    assert f.bar == 3
+    assert f.iommi_evaluate_parameters_signature() == 'request,traversable,x'
+
+
+@pytest.mark.django_db
+def test_freeze(monkeypatch):
+    from iommi import traversable
+
+    apply_style_calls = []
+    original_apply_style = traversable.apply_style
+
+    def counting_apply_style(style_name, obj, is_root):
+        apply_style_calls.append(obj)
+        return original_apply_style(style_name, obj, is_root)
+
+    monkeypatch.setattr(traversable, 'apply_style', counting_apply_style)
+
+    TFoo.objects.create(a=1, b='foo')
+
+    def html(t):
+        return t.bind(request=req('get')).__html__()
+
+    expected = html(Table(auto__model=TFoo, columns__a__filter__include=True))
+
+    frozen = Table(auto__model=TFoo, columns__a__filter__include=True).iommi_freeze()
+    assert html(frozen) == expected
+    calls_on_first_bind = len(apply_style_calls)
+    assert html(frozen) == expected
+    (prototype,) = frozen._iommi_frozen_prototypes.values()
+    assert prototype._declared_members.columns.a._iommi_frozen
+    # Only the parts that are created at bind time have their style applied again
+    assert len(apply_style_calls) - calls_on_first_bind < calls_on_first_bind / 2
+
+
+def test_freeze_set_and_remember_for_reinvoke():
+    form = Form(fields__foo=Field()).iommi_freeze()
+    assert 'foo' in form.bind(request=req('get')).fields
+
+    set_and_remember_for_reinvoke(form._declared_members.fields.foo, include=False)
+    assert 'foo' not in form.bind(request=req('get')).fields
+
+
 def test_initial_setup():
     t = Traversable()
     assert t.iommi_name() is None
@@ -236,6 +333,7 @@ def test_initial_setup():
     assert t._is_bound is False
     assert t.get_request() is None
     assert t.iommi_evaluate_parameters() is None
+    assert t.iommi_evaluate_parameters_signature() is None
 
 
 def test_traversable_repr():